@@ -3,7 +3,16 @@ from streamlit_ace import st_ace
 from src.ast_analyzer import CodeSmellDetector
 from src.ml_classifier import SeverityClassifier
 from src.ai_agent import CodeReviewAgent
+from src.model_router import ModelRouter
+from src.suggestion_engine import TemplateSuggestionEngine
+from src.results_view import SORT_OPTIONS, build_view, get_severity, paginate
+from src.job_queue import AnalysisJobQueue, extract_archive
+from src.baseline import Baseline
+from src.suggestion_index import SuggestionIndex
 import os
+import shutil
+import tempfile
+import uuid
 
 # Page configuration
 st.set_page_config(
@@ -83,9 +92,40 @@ with st.sidebar:
         help="Generate AI-powered refactoring suggestions"
     )
 
+    reuse_suggestions = st.checkbox(
+        "Reuse Similar AI Answers",
+        value=True,
+        disabled=not enable_ai,
+        help="Answer smells like ones asked about before from the local index; "
+             "uncheck to regenerate (replaces the stored answer)"
+    )
+
     if enable_ai and not os.getenv("OPENAI_API_KEY"):
         st.warning("⚠️ OpenAI API key not found in .env file")
 
+    # Known findings to skip
+    st.subheader("Baseline")
+    baseline_file = st.file_uploader(
+        "Baseline file",
+        type=['json'],
+        help="Findings listed in the baseline are skipped before classification"
+    )
+
+    # Parse the baseline only when a different file is uploaded
+    baseline_id = baseline_file.file_id if baseline_file is not None else None
+    if 'baseline' not in st.session_state or st.session_state.baseline_id != baseline_id:
+        st.session_state.baseline_id = baseline_id
+        st.session_state.baseline = Baseline()
+        if baseline_file is not None:
+            try:
+                st.session_state.baseline = Baseline.loads(baseline_file.getvalue().decode('utf-8'))
+            except ValueError as e:
+                st.error(f"❌ Invalid baseline file: {str(e)}")
+    baseline = st.session_state.baseline
+
+    if len(baseline):
+        st.caption(f"📌 {len(baseline)} known finding(s) will be skipped")
+
     st.divider()
     st.markdown("### 📊 About")
     st.info("""
@@ -95,8 +135,54 @@ with st.sidebar:
     - OpenAI Agents SDK
     """)
 
+
+SUGGESTION_INDEX_PATH = 'suggestion_index.npz'
+JOB_PAGE_SIZE = 50
+
+
+@st.cache_resource
+def get_classifier() -> SeverityClassifier:
+    """Severity classifier, loaded once per server."""
+    classifier = SeverityClassifier()
+    try:
+        classifier.load_model('severity_model.pkl')
+    except FileNotFoundError:
+        pass
+    return classifier
+
+
+@st.cache_resource
+def get_router() -> ModelRouter:
+    """Model router shared by all sessions, so cooldowns and stats persist."""
+    return ModelRouter()
+
+
+@st.cache_resource
+def get_suggestion_index() -> SuggestionIndex:
+    """Past AI suggestions, shared by all sessions and kept on disk."""
+    if os.path.exists(SUGGESTION_INDEX_PATH):
+        try:
+            return SuggestionIndex.load(SUGGESTION_INDEX_PATH)
+        except Exception as e:
+            # A corrupt or outdated file only costs the cached answers
+            print(f"⚠️ Could not load {SUGGESTION_INDEX_PATH}, starting empty: {e}")
+    return SuggestionIndex()
+
+
+@st.cache_resource
+def get_job_queue() -> AnalysisJobQueue:
+    """Background job queue shared by all user sessions."""
+    return AnalysisJobQueue(num_workers=max(1, (os.cpu_count() or 2) - 1), classifier=get_classifier())
+
+
+# Identifies this browser session for fair job scheduling
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = uuid.uuid4().hex
+if 'upload_jobs' not in st.session_state:
+    st.session_state.upload_jobs = []
+
 # Main content area with tabs
-tab1, tab2, tab3 = st.tabs(["📝 Code Analysis", "📚 Examples", "ℹ️ Help"])
+tab1, tab_upload, tab2, tab3 = st.tabs(["📝 Code Analysis", "📦 Project Upload", "📚 Examples", "ℹ️ Help"])
 
 with tab1:
     # Two columns: code input and results
@@ -164,49 +250,126 @@ class UserManager:
         if 'analysis_results' not in st.session_state:
             st.session_state.analysis_results = None
 
-        # Perform analysis when button is clicked
-        if analyze_button and code:
-            # Initialize components
-            detector = CodeSmellDetector(
-                max_function_length=max_function_length,
-                max_parameters=max_parameters
-            )
+        detector = CodeSmellDetector(
+            max_function_length=max_function_length,
+            max_parameters=max_parameters
+        )
 
+        # Parse once when the button is clicked; metrics cover every
+        # function and class so threshold changes don't need a re-parse
+        if analyze_button and code:
             with st.spinner("🔬 Analyzing code structure..."):
-                # Detect code smells
-                smells = detector.analyze_code(code)
-
-            if not smells:
-                st.session_state.analysis_results = {'smells': [], 'message': 'success'}
-            else:
-                # Load ML classifier
-                classifier = SeverityClassifier()
-                try:
-                    classifier.load_model('severity_model.pkl')
-                except FileNotFoundError:
-                    pass
-
-                # Predict severities
-                for smell in smells:
-                    predicted_severity = classifier.predict_severity(smell)
-                    smell['predicted_severity'] = predicted_severity
-
-                # Store in session state
-                st.session_state.analysis_results = {'smells': smells, 'message': 'analyzed'}
+                metrics = detector.compute_metrics(code)
+
+            st.session_state.analysis_results = {
+                'metrics': metrics,
+                'code': code,
+                'thresholds': None,
+                'severities': {},  # (type, line, metric) -> predicted severity
+                'suggestions': {}  # (type, qualname, line) -> shown fix / AI answer
+            }
+
+        # (Re-)apply the thresholds whenever the sliders or the baseline changed
+        results = st.session_state.analysis_results
+        thresholds = (max_function_length, max_parameters, baseline_id)
+        if results and results['thresholds'] != thresholds:
+            detected = detector.filter_smells(results['metrics'])
+
+            # Drop known findings before classification and rendering
+            smells = baseline.filter(detected)
+
+            # Predict severities, reusing earlier predictions for the same finding
+            classifier = get_classifier()
+            for smell in smells:
+                key = (smell['type'], smell['line'], smell.get('metric'))
+                if key not in results['severities']:
+                    results['severities'][key] = classifier.predict_severity(smell)
+                smell['predicted_severity'] = results['severities'][key]
+
+            results.update({
+                'smells': smells,
+                'message': 'analyzed' if smells else 'success',
+                'suppressed': len(detected) - len(smells),
+                'baseline_json': Baseline.from_smells(detected).dumps() if detected else None,
+                'thresholds': thresholds,
+                'types': sorted({smell['type'] for smell in smells}),
+                'view': None  # (filter/sort settings, display-ordered indices)
+            })
+            st.session_state.results_page = 1
 
         # Display results from session state
         if st.session_state.analysis_results:
             results = st.session_state.analysis_results
 
-            if results['message'] == 'success':
+            if results['suppressed']:
+                st.caption(f"📌 {results['suppressed']} known finding(s) skipped by the baseline")
+
+            if results['baseline_json']:
+                st.download_button(
+                    "📌 Save Findings as Baseline",
+                    data=results['baseline_json'],
+                    file_name="code_review_baseline.json",
+                    mime="application/json",
+                    help="Upload this file in the sidebar to skip these findings on later runs"
+                )
+
+            if results['message'] == 'success' and results['suppressed']:
+                st.success("✅ No new code smells detected!")
+            elif results['message'] == 'success':
                 st.success("✅ No code smells detected! Your code looks great!")
             elif results['message'] == 'analyzed':
                 smells = results['smells']
                 st.warning(f"⚠️ Detected {len(smells)} code smell(s)")
 
-                # Display each smell
-                for i, smell in enumerate(smells, 1):
-                    severity = smell.get('predicted_severity', smell.get('severity', 'unknown'))
+                # Filter and sort controls
+                filter_col1, filter_col2, filter_col3 = st.columns(3)
+                with filter_col1:
+                    selected_severities = st.multiselect(
+                        "Severity", ['high', 'medium', 'low'],
+                        default=['high', 'medium', 'low'], key="filter_severity"
+                    )
+                with filter_col2:
+                    selected_types = st.multiselect(
+                        "Type", results['types'], default=results['types'], key="filter_type"
+                    )
+                with filter_col3:
+                    name_query = st.text_input("Function / class", key="filter_name")
+
+                sort_col, size_col = st.columns(2)
+                with sort_col:
+                    sort_by = st.selectbox("Sort by", list(SORT_OPTIONS), key="sort_by")
+                with size_col:
+                    page_size = st.selectbox("Per page", [10, 25, 50], key="page_size")
+
+                # Only rebuild the view when filters or sorting change, so reruns
+                # triggered by per-finding buttons don't touch the full result list
+                view_settings = (tuple(selected_severities), tuple(selected_types), name_query, sort_by)
+                if results['view'] is None or results['view'][0] != view_settings:
+                    results['view'] = (
+                        view_settings,
+                        build_view(smells, selected_severities, selected_types, name_query, sort_by)
+                    )
+                    st.session_state.results_page = 1
+                visible = results['view'][1]
+
+                page_indices, num_pages = paginate(
+                    visible, st.session_state.get('results_page', 1), page_size
+                )
+                if st.session_state.get('results_page', 1) > num_pages:
+                    st.session_state.results_page = num_pages
+
+                st.number_input(
+                    f"Page (of {num_pages}) - showing {len(visible)} of {len(smells)} finding(s)",
+                    min_value=1, max_value=num_pages, step=1, key="results_page"
+                )
+
+                template_engine = TemplateSuggestionEngine()
+
+                # Display only the findings on the current page
+                for i in page_indices:
+                    smell = smells[i]
+                    suggestion_key = (smell['type'], smell.get('qualname', smell.get('name')), smell['line'])
+                    severity = get_severity(smell)
                     severity_color = {
                         'high': '🔴',
                         'medium': '🟡',
@@ -217,7 +380,8 @@ class UserManager:
                     st.markdown("---")
                     st.markdown(f"### {severity_color} {smell['type']} - Line {smell['line']} [{severity.upper()}]")
 
-                    # Initialize button variable
+                    # Initialize button variables
+                    fix_clicked = False
                     btn_clicked = False
 
                     col_info, col_action = st.columns([3, 1])
@@ -227,14 +391,32 @@ class UserManager:
                         st.markdown(f"**Issue:** {smell['message']}")
 
                     with col_action:
+                        if template_engine.supports(smell):
+                            fix_clicked = st.button(
+                                "💡 Get Fix",
+                                key=f"fix_btn_{i}",
+                                type="primary",
+                                use_container_width=True
+                            )
+
                         if enable_ai and os.getenv("OPENAI_API_KEY"):
                             btn_clicked = st.button(
-                                "💡 Get AI Fix",
+                                "🤖 Ask AI",
                                 key=f"ai_btn_{i}",
-                                type="primary",
                                 use_container_width=True
                             )
 
+                    # Instant template-based fix (no API call)
+                    if fix_clicked:
+                        suggestion = template_engine.generate_suggestion(smell, results['code'])
+                        if suggestion:
+                            results['suggestions'][suggestion_key] = {
+                                'title': "### 💡 Refactoring Suggestion",
+                                'text': suggestion,
+                            }
+                        else:
+                            st.info("No template available for this smell - try 'Ask AI' for deeper help")
+
                     # Check button state AFTER columns
                     if enable_ai and os.getenv("OPENAI_API_KEY") and btn_clicked:
                         st.info("🤖 Generating AI suggestion... Please wait 10-15 seconds")
@@ -247,13 +429,20 @@ class UserManager:
                             status_text.text("🔍 Analyzing code smell...")
                             progress_bar.progress(33)
 
-                            agent = CodeReviewAgent()
+                            agent = CodeReviewAgent(
+                                router=get_router(),
+                                suggestion_index=get_suggestion_index()
+                            )
 
                             # Step 2
                             status_text.text("📝 Generating suggestions...")
                             progress_bar.progress(66)
 
-                            suggestion = agent.generate_suggestion(smell)
+                            suggestion = agent.generate_suggestion(
+                                smell, deep=True, reuse=reuse_suggestions
+                            )
+                            if agent.last_source == 'llm':
+                                get_suggestion_index().save(SUGGESTION_INDEX_PATH)
 
                             # Step 3
                             status_text.text("✨ Formatting response...")
@@ -263,10 +452,16 @@ class UserManager:
                             progress_bar.empty()
                             status_text.empty()
 
-                            # Show success and suggestion
-                            st.success("✅ AI Suggestion Generated!")
-                            st.markdown("### 💡 AI-Powered Refactoring Suggestion")
-                            st.markdown(suggestion)
+                            # Show success; the suggestion is kept in the results below
+                            if agent.last_source == 'index':
+                                st.success("✅ Reused the AI suggestion for a similar code smell "
+                                           "(uncheck 'Reuse Similar AI Answers' to regenerate)")
+                            else:
+                                st.success("✅ AI Suggestion Generated!")
+                            results['suggestions'][suggestion_key] = {
+                                'title': "### 💡 AI-Powered Refactoring Suggestion",
+                                'text': suggestion,
+                            }
 
                         except Exception as e:
                             progress_bar.empty()
@@ -287,9 +482,115 @@ Troubleshooting:
                     elif enable_ai and not os.getenv("OPENAI_API_KEY"):
                         st.warning("⚠️ API Key missing - Add it to .env file")
 
+                    # Suggestions are stored per finding so they survive reruns
+                    if suggestion_key in results['suggestions']:
+                        shown = results['suggestions'][suggestion_key]
+                        st.markdown(shown['title'])
+                        st.markdown(shown['text'])
+
         else:
             st.info("👈 Enter some Python code and click 'Analyze Code' to get started!")
 
+with tab_upload:
+    st.subheader("📦 Analyze a Project Archive")
+
+    uploaded_archive = st.file_uploader(
+        "Upload a .zip or .tar.gz of your project",
+        type=['zip', 'tar', 'gz', 'tgz'],
+        help="All Python files in the archive are analyzed in the background"
+    )
+
+    if uploaded_archive is not None and st.button("🚀 Start Project Analysis", type="primary"):
+        project_dir = tempfile.mkdtemp(prefix='code_review_')
+        project_files = None
+
+        with tempfile.NamedTemporaryFile(suffix=os.path.basename(uploaded_archive.name)) as archive_file:
+            archive_file.write(uploaded_archive.getbuffer())
+            archive_file.flush()
+            try:
+                project_files = extract_archive(archive_file.name, project_dir)
+            except Exception as e:
+                shutil.rmtree(project_dir, ignore_errors=True)
+                st.error(f"❌ Could not unpack archive: {str(e)}")
+
+        if project_files is not None:
+            job_id = get_job_queue().submit(
+                st.session_state.user_id, project_dir, project_files,
+                max_function_length=max_function_length,
+                max_parameters=max_parameters,
+                baseline=baseline
+            )
+            st.session_state.upload_jobs.append((job_id, uploaded_archive.name))
+            st.success(f"✅ Queued {len(project_files)} Python file(s) for analysis")
+
+    # Live progress and partial results of this session's jobs
+    jobs_running = False
+    for job_id, archive_name in reversed(st.session_state.upload_jobs):
+        job = get_job_queue().get_job(job_id)
+        if job is None:
+            continue
+
+        snapshot = job.snapshot()
+        if snapshot['status'] != 'done':
+            jobs_running = True
+
+        st.markdown("---")
+        st.markdown(f"### 📦 {archive_name} [{snapshot['status'].upper()}]")
+        st.progress(
+            snapshot['processed'] / snapshot['total'] if snapshot['total'] else 1.0,
+            text=f"{snapshot['processed']}/{snapshot['total']} files analyzed - "
+                 f"{len(snapshot['smells'])} code smell(s) found, "
+                 f"{snapshot['suppressed']} skipped by the baseline"
+        )
+
+        if snapshot['smells']:
+            # Only the current page is turned into table rows
+            page_key = f"job_page_{job_id}"
+            page_indices, num_pages = paginate(
+                list(range(len(snapshot['smells']))), st.session_state.get(page_key, 1), JOB_PAGE_SIZE
+            )
+            if st.session_state.get(page_key, 1) > num_pages:
+                st.session_state[page_key] = num_pages
+
+            st.dataframe(
+                [
+                    {
+                        'File': smell['file'],
+                        'Line': smell.get('line'),
+                        'Type': smell['type'],
+                        'Name': smell.get('name', ''),
+                        'Severity': get_severity(smell),
+                        'Issue': smell['message'],
+                    }
+                    for smell in (snapshot['smells'][i] for i in page_indices)
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+            if num_pages > 1:
+                st.number_input(
+                    f"Page (of {num_pages})", min_value=1, max_value=num_pages, step=1, key=page_key
+                )
+
+        if snapshot['status'] == 'done' and (snapshot['smells'] or len(job.baseline)):
+            # Fingerprints include the archive paths, so this baseline matches re-uploads
+            st.download_button(
+                "📌 Save Findings as Baseline",
+                data=job.baseline.extended(snapshot['smells']).dumps(),
+                file_name="project_baseline.json",
+                mime="application/json",
+                key=f"baseline_{job_id}",
+                help="Upload it in the sidebar to skip these findings next time"
+            )
+
+        if snapshot['errors']:
+            with st.expander(f"⚠️ {len(snapshot['errors'])} file(s) could not be analyzed"):
+                st.dataframe(snapshot['errors'], use_container_width=True, hide_index=True)
+
+    # Progress is pulled on demand; automatic reruns would reset every other tab
+    if jobs_running:
+        st.button("🔄 Refresh Progress", key="refresh_jobs")
+
 with tab2:
     st.subheader("📚 Example Code Smells")
 
@@ -385,3 +686,26 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+# Model tier latency and token usage (after this run's AI calls)
+if enable_ai:
+    with st.sidebar:
+        st.markdown("### ⏱️ Model Tiers")
+        st.dataframe(
+            [
+                {
+                    'Tier': tier,
+                    'Model': stats['model'],
+                    'Requests': stats['requests'],
+                    'Over budget': stats['budget_exceeded'],
+                    'Errors': stats['errors'],
+                    'p95 (s)': round(stats['p95_latency'], 2),
+                    'SLO (s)': stats['latency_slo'],
+                    'Tokens': stats['prompt_tokens'] + stats['completion_tokens'],
+                }
+                for tier, stats in get_router().get_stats().items()
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
@@ -0,0 +1,160 @@
+import random
+import time
+import numpy as np
+from src.suggestion_index import SuggestionIndex, similarity_group, similarity_text
+
+random.seed(42)
+
+VERBS = ['create', 'update', 'delete', 'process', 'load', 'export', 'send', 'validate', 'build', 'parse']
+NOUNS = ['user', 'order', 'invoice', 'payment', 'report', 'profile', 'session', 'email', 'config', 'item']
+
+
+def random_smell() -> dict:
+    """Synthetic smell in the detector's message format."""
+    name = f"{random.choice(VERBS)}_{random.choice(NOUNS)}"
+    smell_type = random.choice(['TooManyParameters', 'LongFunction'])
+    if smell_type == 'TooManyParameters':
+        metric = random.randint(6, 12)
+        message = f"Function {name} has {metric} parameters (recommended: max 5)"
+        severity = 'low'
+    else:
+        metric = random.randint(21, 60)
+        message = f"Function {name} has {metric} statements (recommended: max 20)"
+        severity = 'medium'
+    return {'type': smell_type, 'name': name, 'metric': metric, 'message': message, 'severity': severity}
+
+
+def renamed(smell: dict) -> dict:
+    """Same smell on a differently named function."""
+    name = smell['name']
+    while name == smell['name']:
+        name = f"{random.choice(VERBS)}_{random.choice(NOUNS)}"
+    return dict(smell, name=name, message=smell['message'].replace(smell['name'], name))
+
+
+def resized(smell: dict) -> dict:
+    """Same function with a different size metric (should not reuse blindly)."""
+    old = f"has {smell['metric']} "
+    metric = smell['metric'] + random.choice([-3, -2, -1, 1, 2, 3])
+    return dict(smell, metric=metric, message=smell['message'].replace(old, f"has {metric} "))
+
+
+def rethresholded(smell: dict) -> dict:
+    """Same size, reported under a different detector threshold."""
+    limit = int(smell['message'].rsplit('max ', 1)[1].rstrip(')'))
+    new_limit = limit + random.choice([-2, -1, 1, 2]) * (5 if limit >= 20 else 1)
+    return renamed(dict(smell, message=smell['message'].replace(f"max {limit})", f"max {new_limit})")))
+
+
+def reclassified(smell: dict) -> dict:
+    """Same size, but the ML model predicted a different severity."""
+    return renamed(dict(smell, predicted_severity=random.choice(
+        [s for s in ('low', 'medium', 'high') if s != smell['severity']]
+    )))
+
+
+def qualified(smell: dict) -> dict:
+    """Same size, reported as a method with its class-qualified name."""
+    query = renamed(smell)
+    owner = f"{random.choice(NOUNS).capitalize()}Service"
+    return dict(query, message=query['message'].replace(query['name'], f"{owner}.{query['name']}"))
+
+
+# Renamed smells are identical once the name is masked, so an exact-key cache
+# would reuse them too. The other variants are similar but not identical:
+# they're what the n-gram index is for. Every variant keeps the stored smell's
+# type and metric, so reusing its suggestion is correct.
+VARIANTS = {
+    'renamed': renamed,
+    'threshold': rethresholded,
+    'severity': reclassified,
+    'qualified': qualified,
+}
+
+# Smells with a different metric are near misses: grouped on type alone they
+# are reused below a 0.9 threshold, grouped on type+metric they never match.
+print("📈 Recall / precision per query variant (1000 stored smells, 1000 queries each)")
+stored = [random_smell() for _ in range(1000)]
+variant_queries = {name: [make(random.choice(stored)) for _ in range(1000)]
+                   for name, make in VARIANTS.items()}
+stored_keys = {(s['type'], s['metric']) for s in stored}
+near_misses = [q for q in (resized(random.choice(stored)) for _ in range(3000))
+               if (q['type'], q['metric']) not in stored_keys][:1000]
+
+# Exact-key cache on the masked text, for comparison
+exact_cache = {(similarity_group(s), similarity_text(s)): f"{s['type']}:{s['metric']}" for s in stored}
+print("  exact-key cache:            " + "  ".join(
+    f"{name} {sum((similarity_group(q), similarity_text(q)) in exact_cache for q in queries) / len(queries) * 100:5.1f}%"
+    for name, queries in variant_queries.items()
+))
+
+default_threshold = SuggestionIndex().threshold
+results = {}
+for grouping, group_of in (('type', lambda s: s['type']), ('type+metric', similarity_group)):
+    for threshold in (0.8, 0.85, 0.9, 0.95):
+        index = SuggestionIndex(threshold=threshold)
+        for smell in stored:
+            index.add(similarity_text(smell), f"{smell['type']}:{smell['metric']}",
+                      group=group_of(smell), name=smell['name'])
+
+        columns = []
+        for name, queries in variant_queries.items():
+            hits = correct = 0
+            for query in queries:
+                match = index.query(similarity_text(query), group_of(query))
+                if match is not None:
+                    hits += 1
+                    correct += match['suggestion'] == f"{query['type']}:{query['metric']}"
+            # Precision is undefined when nothing was reused
+            precision = correct / hits if hits else None
+            results[grouping, threshold, name] = (correct / len(queries), precision)
+            columns.append(f"{name} {correct / len(queries) * 100:5.1f}%/"
+                           + (f"{precision * 100:5.1f}%" if precision is not None else "  n/a "))
+
+        reused = sum(index.query(similarity_text(q), group_of(q)) is not None for q in near_misses)
+        results[grouping, threshold, 'near_miss'] = reused
+
+        print(f"  {grouping:<11} @ {threshold:.2f}:    " + "  ".join(columns) +
+              f"  near-miss reuse {reused / max(len(near_misses), 1) * 100:5.1f}%")
+print("  (recall/precision per variant)")
+
+# The agent's configuration (type+metric groups, default threshold) never
+# hands out an answer written for a different size, still reuses renamed
+# smells, and reuses some similar-but-not-identical ones an exact-key cache misses
+assert results['type+metric', default_threshold, 'near_miss'] == 0
+assert results['type+metric', default_threshold, 'renamed'] == (1.0, 1.0)
+assert results['type+metric', default_threshold, 'threshold'][0] > 0
+assert all(results['type+metric', default_threshold, name][1] in (1.0, None) for name in VARIANTS)
+
+# Latency: query cost grows linearly with the number of stored suggestions
+print("\n⏱️ Query latency")
+for size in (1000, 5000, 20000):
+    index = SuggestionIndex(max_size=size)
+    for _ in range(size):
+        smell = random_smell()
+        index.add(similarity_text(smell), 'suggestion', group=smell['type'], name=smell['name'])
+
+    timings = []
+    for _ in range(200):
+        smell = random_smell()
+        start = time.perf_counter()
+        index.query(similarity_text(smell), smell['type'])
+        timings.append(time.perf_counter() - start)
+
+    print(f"  {size:>6} entries: p50 {np.percentile(timings, 50) * 1000:.3f} ms, "
+          f"p99 {np.percentile(timings, 99) * 1000:.3f} ms, "
+          f"memory {index.vectors.nbytes / 1024 ** 2:.1f} MB")
+
+# Eviction keeps the index bounded and retains recently used entries
+index = SuggestionIndex(max_size=100)
+kept = random_smell()
+index.add(similarity_text(kept), 'kept', group=kept['type'], name=kept['name'])
+for i in range(500):
+    index.query(similarity_text(kept), kept['type'])
+    smell = random_smell()
+    # Distinct texts, identical ones would replace each other
+    index.add(similarity_text(smell) + f' filler {i}', 'filler', group=smell['type'])
+
+assert index.size == 100
+assert index.query(similarity_text(kept), kept['type'])['suggestion'] == 'kept'
+print("\n♻️ Eviction: size stays at 100 after 500 inserts, recently used entry retained")
@@ -0,0 +1,10 @@
+from generate_training_data import training_data
+from src.model_selection import ModelSelectionHarness
+
+# Compare candidate models with 5-fold cross-validation on all cores
+harness = ModelSelectionHarness(n_splits=5, n_jobs=-1, latency_budget_ms=1.0)
+results = harness.evaluate(training_data)
+harness.print_report(results)
+
+best = results[0]
+print(f"\n🏆 Recommended model: {best['name']}")
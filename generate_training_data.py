@@ -24,11 +24,12 @@ training_data = [
     {'type': 'TooManyParameters', 'line': 140, 'message': 'Function has 10 parameters', 'severity': 'low'},
 ]
 
-# Train the classifier
-classifier = SeverityClassifier()
-classifier.train(training_data)
+if __name__ == '__main__':
+    # Train the classifier
+    classifier = SeverityClassifier()
+    classifier.train(training_data)
 
-# Save the trained model
-classifier.save_model('severity_model.pkl')
+    # Save the trained model
+    classifier.save_model('severity_model.pkl')
 
-print("\n✅ Training complete! Model saved.")
+    print("\n✅ Training complete! Model saved.")
@@ -1,11 +1,21 @@
 import os
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import (OpenAI, APIConnectionError, APITimeoutError, InternalServerError,
+                    RateLimitError)
+from src.model_router import ModelRouter
+from src.suggestion_index import SuggestionIndex, similarity_group, similarity_text
+from src.suggestion_engine import TemplateSuggestionEngine
 
 # Load environment variables
 load_dotenv()
 
+# Rate limits and server errors are retried (like the client's own default
+# of 2 retries); timeouts are not, they fall back to a faster tier instead
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5  # seconds, doubled after every attempt
+
 
 class CodeReviewAgent:
     """
@@ -13,8 +23,16 @@ class CodeReviewAgent:
     using OpenAI's Chat Completions API.
     """
 
-    def __init__(self):
-        """Initialize the AI agent with OpenAI client."""
+    def __init__(self, router: Optional[ModelRouter] = None, base_url: Optional[str] = None,
+                 suggestion_index: Optional[SuggestionIndex] = None):
+        """
+        Initialize the AI agent with OpenAI client.
+
+        Args:
+            router: Model routing table and latency tracker (defaults to ModelRouter())
+            base_url: Alternative API endpoint, e.g. a local stub server
+            suggestion_index: Past LLM suggestions to reuse for similar smells
+        """
         # Verify API key is set
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError(
@@ -23,7 +41,19 @@ class CodeReviewAgent:
             )
 
         # Create OpenAI client
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=base_url)
+
+        # Picks model, token cap and prompt variant per smell
+        self.router = router or ModelRouter()
+
+        # Local engine for routine smells (no API call needed)
+        self.template_engine = TemplateSuggestionEngine()
+
+        # Similar smells reuse earlier LLM answers (None disables reuse)
+        self.suggestion_index = suggestion_index
+
+        # Where the last suggestion came from: 'template', 'index' or 'llm'
+        self.last_source: Optional[str] = None
 
         # System prompt for the agent
         self.system_prompt = """You are an expert code reviewer specializing in Python best practices.
@@ -49,39 +79,118 @@ Format your response with clear sections:
 ## Additional Best Practices
 """
 
-    def generate_suggestion(self, smell: Dict) -> str:
+    def generate_suggestion(self, smell: Dict, source_code: Optional[str] = None,
+                            deep: bool = False, reuse: bool = True) -> str:
         """
-        Generate an AI-powered suggestion for fixing a code smell.
+        Generate a suggestion for fixing a code smell.
+
+        Routine smells are answered instantly by the template engine;
+        the LLM is only called when deep=True or no template applies,
+        and only if no similar smell was answered before (unless reuse=False).
 
         Args:
             smell: Dictionary containing code smell information
+            source_code: Source the smell was detected in (enables templates)
+            deep: Skip the templates and ask the LLM for a detailed answer
+            reuse: Answer from the suggestion index when a similar smell was
+                seen; False regenerates and replaces the stored answer
 
         Returns:
             Detailed suggestion with code examples
         """
-        # Create a detailed prompt for the agent
-        prompt = self._create_prompt(smell)
+        if not deep:
+            suggestion = self.template_engine.generate_suggestion(smell, source_code)
+            if suggestion is not None:
+                self.last_source = 'template'
+                return suggestion
 
-        try:
-            # Call OpenAI Chat Completions API
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Fast and cost-effective
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+        if self.suggestion_index is not None and reuse:
+            match = self.suggestion_index.query(similarity_text(smell), similarity_group(smell))
+            if match is not None:
+                self.last_source = 'index'
+                return SuggestionIndex.adapt(match, smell.get('name'))
+
+        self.last_source = None
+
+        tier = self.router.select_tier(smell)
 
-            return response.choices[0].message.content
+        try:
+            while True:
+                try:
+                    suggestion = self._call_tier(tier, smell)
+                    self.last_source = 'llm'
+                    if self.suggestion_index is not None:
+                        self.suggestion_index.add(
+                            similarity_text(smell), suggestion,
+                            group=similarity_group(smell), name=smell.get('name')
+                        )
+                    return suggestion
+                except APITimeoutError:
+                    # Latency budget exceeded, retry on a cheaper/faster tier
+                    tier = self.router.fallback_for(tier)
+                    if tier is None:
+                        raise
 
         except Exception as e:
             return f"Error generating suggestion: {str(e)}"
 
-    def _create_prompt(self, smell: Dict) -> str:
+    def _call_tier(self, tier: str, smell: Dict) -> str:
+        """
+        Call the model configured for a tier, recording latency and token usage.
+        """
+        config = self.router.tiers[tier]
+
+        # Create a detailed prompt for the agent
+        prompt = self._create_prompt(smell, config['prompt_variant'])
+
+        # The tier's latency budget doubles as the request timeout.
+        # The client's own retries are off because they would also retry
+        # timeouts; other transient errors are retried below.
+        client = self.client.with_options(timeout=config['latency_slo'], max_retries=0)
+
+        for attempt in range(MAX_RETRIES + 1):
+            start = time.perf_counter()
+            try:
+                # Call OpenAI Chat Completions API
+                response = client.chat.completions.create(
+                    model=config['model'],
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=config['max_tokens']
+                )
+                break
+            except APITimeoutError:
+                self.router.record(tier, time.perf_counter() - start, timed_out=True)
+                raise
+            except (RateLimitError, InternalServerError, APIConnectionError):
+                self.router.record(tier, time.perf_counter() - start, failed=True)
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+            except Exception:
+                self.router.record(tier, time.perf_counter() - start, failed=True)
+                raise
+
+        usage = response.usage
+        self.router.record(
+            tier,
+            time.perf_counter() - start,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0
+        )
+
+        return response.choices[0].message.content
+
+    def _create_prompt(self, smell: Dict, variant: str = 'standard') -> str:
         """
         Create a detailed prompt for the AI agent.
+
+        Args:
+            smell: Dictionary containing code smell information
+            variant: 'concise', 'standard' or 'detailed'
         """
         smell_type = smell.get('type', 'Unknown')
         smell_name = smell.get('name', 'unknown')
@@ -103,14 +212,20 @@ Please provide:
 4. Best practices to prevent this in the future
 """
 
+        if variant == 'concise':
+            prompt += "\nKeep the answer short: one paragraph per section and a single small code example.\n"
+        elif variant == 'detailed':
+            prompt += "\nGo in depth: discuss alternative designs and their trade-offs, and show a complete refactored example.\n"
+
         return prompt
 
-    def batch_analyze(self, smells: List[Dict]) -> List[Dict]:
+    def batch_analyze(self, smells: List[Dict], source_code: Optional[str] = None) -> List[Dict]:
         """
         Generate suggestions for multiple code smells.
 
         Args:
             smells: List of code smell dictionaries
+            source_code: Source the smells were detected in (enables templates)
 
         Returns:
             List of smells with added 'ai_suggestion' field
@@ -120,7 +235,7 @@ Please provide:
         for i, smell in enumerate(smells, 1):
             print(f"\n🤖 Generating AI suggestion {i}/{len(smells)}...")
 
-            suggestion = self.generate_suggestion(smell)
+            suggestion = self.generate_suggestion(smell, source_code)
             smell_with_suggestion = smell.copy()
             smell_with_suggestion['ai_suggestion'] = suggestion
             results.append(smell_with_suggestion)
@@ -1,5 +1,23 @@
 import ast
-from typing import List, Dict, Optional
+from typing import List, Dict
+import numpy as np
+
+
+def qualified_names(tree: ast.AST) -> Dict[ast.AST, str]:
+    """Map every function and class node to its dotted qualified name."""
+    qualnames = {}
+
+    def visit(node: ast.AST, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                qualnames[child] = qualname
+                visit(child, qualname + '.')
+            else:
+                visit(child, prefix)
+
+    visit(tree, '')
+    return qualnames
 
 
 class CodeSmellDetector:
@@ -7,10 +25,11 @@ class CodeSmellDetector:
     Detects code smells using AST parsing.
     """
 
-    def __init__(self, max_function_length: int = 20, max_parameters: int = 5):
+    def __init__(self, max_function_length: int = 20, max_parameters: int = 5,
+                 max_methods: int = 15):
         self.max_function_length = max_function_length
         self.max_parameters = max_parameters
-        pass
+        self.max_methods = max_methods
 
     def analyze_code(self, source_code: str) -> List[Dict]:
         """
@@ -20,73 +39,134 @@ class CodeSmellDetector:
         Returns:
             List of Dict with informations about code smells
         """
+        return self.filter_smells(self.compute_metrics(source_code))
+
+    def compute_metrics(self, source_code: str) -> Dict:
+        """
+        Parse the code once and collect metrics for every function and class,
+        whether or not they exceed the thresholds.
+
+        Args:
+            source_code: Python code in a String format
 
-        smells = []
+        Returns:
+            Dict with a 'functions' and a 'classes' table (column name -> array)
+            and 'syntax_error' (a smell dict, or None)
+        """
+        functions = {'name': [], 'qualname': [], 'line': [], 'end_line': [],
+                     'statements': [], 'params': [], 'order': []}
+        classes = {'name': [], 'qualname': [], 'line': [], 'end_line': [],
+                   'methods': [], 'order': []}
+        syntax_error = None
 
         try:
             tree = ast.parse(source_code)
+            qualnames = qualified_names(tree)
 
-            for node in ast.walk(tree):
+            # 'order' keeps smells in ast.walk order, as they were always reported
+            for order, node in enumerate(ast.walk(tree)):
                 if isinstance(node, ast.FunctionDef):
-                    smell = self._check_function(node)
-                    if smell:
-                        smells.append(smell)
+                    functions['name'].append(node.name)
+                    functions['qualname'].append(qualnames[node])
+                    functions['line'].append(node.lineno)
+                    functions['end_line'].append(node.end_lineno)
+                    functions['statements'].append(len(node.body))
+                    functions['params'].append(len(node.args.args))
+                    functions['order'].append(order)
                 elif isinstance(node, ast.ClassDef):
-                    smell = self._check_class(node)
-                    if smell:
-                        smells.append(smell)
+                    classes['name'].append(node.name)
+                    classes['qualname'].append(qualnames[node])
+                    classes['line'].append(node.lineno)
+                    classes['end_line'].append(node.end_lineno)
+                    classes['methods'].append(
+                        sum(1 for n in node.body if isinstance(n, ast.FunctionDef))
+                    )
+                    classes['order'].append(order)
 
         except SyntaxError as e:
-            smells.append(
-                {
-                    "type": "SyntaxError",
-                    "message": f"Syntax error: {str(e)}",
-                    "line": e.lineno,
-                }
-            )
-
-        return smells
-
-
-    def _check_function(self, node: ast.FunctionDef) -> Optional[Dict]:
-
-
-        function_length = len(node.body)
-
-        num_params = len(node.args.args)
-
-        if function_length > self.max_function_length:
-            return {
-                "type": "LongFunction",
-                "name": node.name,
-                "line": node.lineno,
-                "message": f"Function {node.name} has {function_length} statements (recommended: max {self.max_function_length})",
-                "severity": "medium",  # Pentru ML classifier
+            syntax_error = {
+                "type": "SyntaxError",
+                "message": f"Syntax error: {str(e)}",
+                "line": e.lineno,
             }
 
-        if num_params > self.max_parameters:
-            return {
-                "type": "TooManyParameters",
-                "name": node.name,
-                "line": node.lineno,
-                "message": f"Function {node.name} has {num_params} parameters (recommended: max {self.max_parameters})",
-                "severity": "low",
-            }
-
-        return None
-
+        return {
+            'functions': {k: np.array(v, dtype=object if k in ('name', 'qualname') else np.int64)
+                          for k, v in functions.items()},
+            'classes': {k: np.array(v, dtype=object if k in ('name', 'qualname') else np.int64)
+                        for k, v in classes.items()},
+            'syntax_error': syntax_error,
+        }
 
-    def _check_class(self, node: ast.ClassDef) -> Optional[Dict]:
+    def filter_smells(self, metrics: Dict) -> List[Dict]:
+        """
+        Turn a metrics table into code smells using the current thresholds.
 
-        num_methods = sum(1 for n in node.body if isinstance(n, ast.FunctionDef))
+        Cheap enough to re-run on every threshold change without re-parsing.
 
-        if num_methods > 15:
-            return {
-                "type": "GodClass",
-                "name": node.name,
-                "line": node.lineno,
-                "message": f"Class {node.name} has {num_methods} methods (possible God Class)",
-                "severity": "high",
-            }
+        Args:
+            metrics: Output of compute_metrics()
 
-        return None
+        Returns:
+            List of Dict with informations about code smells
+        """
+        if metrics['syntax_error'] is not None:
+            return [dict(metrics['syntax_error'])]
+
+        functions = metrics['functions']
+        classes = metrics['classes']
+
+        # A function is reported once: LongFunction wins over TooManyParameters
+        long_mask = functions['statements'] > self.max_function_length
+        params_mask = ~long_mask & (functions['params'] > self.max_parameters)
+        god_mask = classes['methods'] > self.max_methods
+
+        flagged = []
+        for i in np.flatnonzero(long_mask):
+            flagged.append((functions['order'][i], self._long_function_smell(functions, i)))
+        for i in np.flatnonzero(params_mask):
+            flagged.append((functions['order'][i], self._too_many_parameters_smell(functions, i)))
+        for i in np.flatnonzero(god_mask):
+            flagged.append((classes['order'][i], self._god_class_smell(classes, i)))
+
+        flagged.sort(key=lambda item: item[0])
+        return [smell for _, smell in flagged]
+
+    def _long_function_smell(self, functions: Dict, i: int) -> Dict:
+        name = functions['name'][i]
+        function_length = int(functions['statements'][i])
+        return {
+            "type": "LongFunction",
+            "name": name,
+            "qualname": functions['qualname'][i],
+            "line": int(functions['line'][i]),
+            "metric": function_length,
+            "message": f"Function {name} has {function_length} statements (recommended: max {self.max_function_length})",
+            "severity": "medium",  # Pentru ML classifier
+        }
+
+    def _too_many_parameters_smell(self, functions: Dict, i: int) -> Dict:
+        name = functions['name'][i]
+        num_params = int(functions['params'][i])
+        return {
+            "type": "TooManyParameters",
+            "name": name,
+            "qualname": functions['qualname'][i],
+            "line": int(functions['line'][i]),
+            "metric": num_params,
+            "message": f"Function {name} has {num_params} parameters (recommended: max {self.max_parameters})",
+            "severity": "low",
+        }
+
+    def _god_class_smell(self, classes: Dict, i: int) -> Dict:
+        name = classes['name'][i]
+        num_methods = int(classes['methods'][i])
+        return {
+            "type": "GodClass",
+            "name": name,
+            "qualname": classes['qualname'][i],
+            "line": int(classes['line'][i]),
+            "metric": num_methods,
+            "message": f"Class {name} has {num_methods} methods (possible God Class)",
+            "severity": "high",
+        }
@@ -0,0 +1,122 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional
+
+BASELINE_VERSION = 1
+
+# Metrics are floor-bucketed so that small changes (one more statement in
+# an already long function) don't turn a known finding into a new one.
+# Crossing a bucket boundary does: a LongFunction at 20-24 statements has
+# one fingerprint, growing it to 25 reports it again. That is intended -
+# a known finding that keeps growing deserves another look.
+METRIC_BUCKETS = {
+    'LongFunction': 5,
+    'GodClass': 5,
+}
+
+
+def _normalized_metric(smell: Dict) -> int:
+    """Bucketed size metric of a smell (statements, parameters, methods)."""
+    metric = smell.get('metric')
+    if metric is None:
+        # Older smell dicts only carry the number in the message
+        numbers = [int(s) for s in smell.get('message', '').split() if s.isdigit()]
+        metric = numbers[0] if numbers else 0
+    return metric // METRIC_BUCKETS.get(smell.get('type'), 1)
+
+
+def fingerprint(smell: Dict) -> str:
+    """
+    Stable identifier of a finding that doesn't depend on its line number.
+
+    The file path is part of the fingerprint, so a baseline only applies
+    to findings from the same source (editor findings have file '').
+    The metric is bucketed, see METRIC_BUCKETS: it stays stable within
+    a bucket and changes when the metric crosses into the next one.
+
+    Args:
+        smell: Dictionary containing code smell information
+
+    Returns:
+        Hex digest of file, type, qualified name and normalized metric
+    """
+    parts = (
+        smell.get('file', ''),
+        smell.get('type', ''),
+        smell.get('qualname', smell.get('name', '')),
+        str(_normalized_metric(smell)),
+    )
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class Baseline:
+    """
+    Set of known, accepted findings that are skipped on later runs.
+    """
+
+    def __init__(self, fingerprints: Optional[Iterable[str]] = None):
+        self.fingerprints = set(fingerprints or ())
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    @classmethod
+    def from_smells(cls, smells: Iterable[Dict]) -> 'Baseline':
+        """Create a baseline that accepts all of the given findings."""
+        return cls(fingerprint(smell) for smell in smells)
+
+    def extended(self, smells: Iterable[Dict]) -> 'Baseline':
+        """New baseline accepting both the known findings and the given ones."""
+        return Baseline(self.fingerprints | {fingerprint(smell) for smell in smells})
+
+    def filter(self, smells: List[Dict]) -> List[Dict]:
+        """
+        Drop known findings.
+
+        Args:
+            smells: Code smells straight from the detector
+
+        Returns:
+            Only the findings that are not in the baseline
+        """
+        if not self.fingerprints:
+            return smells
+        return [smell for smell in smells if fingerprint(smell) not in self.fingerprints]
+
+    def dumps(self) -> str:
+        """Serialize to the baseline file format."""
+        return json.dumps({
+            'version': BASELINE_VERSION,
+            'fingerprints': sorted(self.fingerprints),
+        }, indent=2)
+
+    @classmethod
+    def loads(cls, text: str) -> 'Baseline':
+        """
+        Parse a baseline file's contents.
+
+        Raises:
+            ValueError: If the text is not a baseline file (json.JSONDecodeError
+                is a ValueError too)
+        """
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise ValueError("Baseline file must contain a JSON object")
+        if data.get('version') != BASELINE_VERSION:
+            raise ValueError(f"Unsupported baseline version: {data.get('version')}")
+
+        fingerprints = data.get('fingerprints')
+        if not isinstance(fingerprints, list) or not all(isinstance(fp, str) for fp in fingerprints):
+            raise ValueError("Baseline 'fingerprints' must be a list of strings")
+        return cls(fingerprints)
+
+    def save(self, filepath: str):
+        """Save baseline to disk."""
+        with open(filepath, 'w') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, filepath: str) -> 'Baseline':
+        """Load baseline from disk."""
+        with open(filepath, 'r') as f:
+            return cls.loads(f.read())
@@ -0,0 +1,181 @@
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FindingsStore:
+    """
+    Persistent SQLite store for code smell findings across commits.
+    """
+
+    # Columns that historical queries filter or group on
+    INDEXED_COLUMNS = ('file_path', 'type', 'severity', 'name', 'commit_sha')
+
+    def __init__(self, db_path: str = 'findings.db'):
+        """
+        Open (or create) the findings database.
+
+        Args:
+            db_path: Path to the SQLite file (':memory:' for a throwaway store)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the findings table and its indexes if they don't exist."""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS findings (
+                id INTEGER PRIMARY KEY,
+                commit_sha TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                type TEXT NOT NULL,
+                name TEXT,
+                qualname TEXT,
+                line INTEGER,
+                severity TEXT,
+                message TEXT
+            )
+        """)
+
+        for column in self.INDEXED_COLUMNS:
+            self.conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_findings_{column} ON findings ({column})"
+            )
+
+        # Covering index for new-vs-fixed diffs between two commits
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_findings_commit_identity
+            ON findings (commit_sha, file_path, type, qualname)
+        """)
+        self.conn.commit()
+
+    def add_findings(self, smells: Iterable[Dict], commit_sha: str, file_path: str = '') -> int:
+        """
+        Bulk insert the findings of one analysis run.
+
+        Findings already stored for the same commit and file are replaced,
+        so ingesting a commit twice doesn't count its findings twice.
+
+        Args:
+            smells: Code smell dictionaries as returned by CodeSmellDetector
+            commit_sha: Commit the findings belong to
+            file_path: Default file path for smells that don't carry a 'file' key
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = [
+            (
+                commit_sha,
+                smell.get('file', file_path),
+                smell.get('type', 'Unknown'),
+                smell.get('name'),
+                smell.get('qualname', smell.get('name')),
+                smell.get('line'),
+                smell.get('predicted_severity', smell.get('severity')),
+                smell.get('message', ''),
+            )
+            for smell in smells
+        ]
+
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM findings WHERE commit_sha = ? AND file_path = ?",
+                [(commit_sha, path) for path in sorted({row[1] for row in rows})]
+            )
+            self.conn.executemany(
+                "INSERT INTO findings "
+                "(commit_sha, file_path, type, name, qualname, line, severity, message) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        return len(rows)
+
+    def top_offenders(self, by: str = 'file_path', limit: int = 10,
+                      commit_sha: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Rank files, functions or smell types by number of findings.
+
+        Args:
+            by: Column to group on ('file_path', 'name' or 'type')
+            limit: Maximum number of rows to return
+            commit_sha: Restrict the ranking to a single commit
+
+        Returns:
+            List of (value, count) tuples, most frequent first
+        """
+        if by not in ('file_path', 'name', 'type'):
+            raise ValueError(f"Cannot rank findings by '{by}'")
+
+        query = f"SELECT {by}, COUNT(*) AS n FROM findings"
+        params: List = []
+        if commit_sha is not None:
+            query += " WHERE commit_sha = ?"
+            params.append(commit_sha)
+        query += f" GROUP BY {by} ORDER BY n DESC, {by} LIMIT ?"
+        params.append(limit)
+
+        return self.conn.execute(query, params).fetchall()
+
+    def new_vs_fixed(self, base_commit: str, head_commit: str) -> Dict[str, List[Tuple]]:
+        """
+        Compare the findings of two commits.
+
+        Findings are matched on (file, type, qualified name) so that line
+        shifts between the commits don't show up as new or fixed issues,
+        while same-named methods of different classes stay distinct.
+
+        Args:
+            base_commit: Older commit
+            head_commit: Newer commit
+
+        Returns:
+            Dictionary with 'new' and 'fixed' lists of (file, type, qualname) tuples
+        """
+        diff_query = """
+            SELECT file_path, type, qualname FROM findings WHERE commit_sha = ?
+            EXCEPT
+            SELECT file_path, type, qualname FROM findings WHERE commit_sha = ?
+            ORDER BY 1, 2, 3
+        """
+
+        return {
+            'new': self.conn.execute(diff_query, (head_commit, base_commit)).fetchall(),
+            'fixed': self.conn.execute(diff_query, (base_commit, head_commit)).fetchall(),
+        }
+
+    def severity_histogram(self, commit_sha: Optional[str] = None,
+                           file_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count findings per severity.
+
+        Args:
+            commit_sha: Restrict the histogram to a single commit
+            file_path: Restrict the histogram to a single file
+
+        Returns:
+            Dictionary mapping severity to number of findings
+        """
+        query = "SELECT severity, COUNT(*) FROM findings"
+        conditions = []
+        params: List = []
+
+        if commit_sha is not None:
+            conditions.append("commit_sha = ?")
+            params.append(commit_sha)
+        if file_path is not None:
+            conditions.append("file_path = ?")
+            params.append(file_path)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY severity"
+
+        return dict(self.conn.execute(query, params).fetchall())
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
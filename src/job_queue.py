@@ -0,0 +1,289 @@
+import multiprocessing
+import os
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from src.ast_analyzer import CodeSmellDetector
+from src.baseline import Baseline
+
+
+def extract_archive(archive_path: str, dest_dir: str, max_files: int = 10000,
+                    max_bytes: int = 200 * 1024 * 1024) -> List[str]:
+    """
+    Unpack a zip or tar archive and list the Python files it contains.
+
+    Members that would land outside dest_dir (absolute paths, '..',
+    links) are rejected, and so are archives that would unpack to more
+    than max_bytes (zip bombs). Sizes are read from the archive headers
+    before anything is written.
+
+    Args:
+        archive_path: Path to a .zip, .tar, .tar.gz or .tgz file
+        dest_dir: Directory to extract into
+        max_files: Maximum number of archive members
+        max_bytes: Maximum total uncompressed size of the members
+
+    Returns:
+        Sorted paths of the extracted .py files, relative to dest_dir
+    """
+    dest_root = os.path.realpath(dest_dir)
+
+    def safe_target(name: str) -> str:
+        target = os.path.realpath(os.path.join(dest_root, name))
+        if os.path.commonpath([dest_root, target]) != dest_root:
+            raise ValueError(f"Unsafe path in archive: {name}")
+        return target
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            members = archive.infolist()
+            if len(members) > max_files:
+                raise ValueError(f"Archive has more than {max_files} files")
+            if sum(member.file_size for member in members) > max_bytes:
+                raise ValueError(f"Archive unpacks to more than {max_bytes} bytes")
+            for member in members:
+                safe_target(member.filename)
+            archive.extractall(dest_root)
+
+    elif tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path) as archive:
+            members = archive.getmembers()
+            if len(members) > max_files:
+                raise ValueError(f"Archive has more than {max_files} files")
+            if sum(member.size for member in members) > max_bytes:
+                raise ValueError(f"Archive unpacks to more than {max_bytes} bytes")
+            for member in members:
+                if not (member.isfile() or member.isdir()):
+                    raise ValueError(f"Unsupported archive member: {member.name}")
+                safe_target(member.name)
+            archive.extractall(dest_root, members=members)
+
+    else:
+        raise ValueError("Unsupported archive format (expected .zip or .tar.gz)")
+
+    python_files = []
+    for root, _, names in os.walk(dest_root):
+        for name in names:
+            if name.endswith('.py'):
+                python_files.append(os.path.relpath(os.path.join(root, name), dest_root))
+
+    return sorted(python_files)
+
+
+def _analyze_file(path: str, max_function_length: int, max_parameters: int) -> List[Dict]:
+    """Analyze one file (runs in a worker process)."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+
+    detector = CodeSmellDetector(
+        max_function_length=max_function_length,
+        max_parameters=max_parameters
+    )
+    return detector.analyze_code(source)
+
+
+class AnalysisJob:
+    """
+    State of one uploaded project being analyzed in the background.
+    """
+
+    def __init__(self, user_id: str, root_dir: str, files: List[str],
+                 max_function_length: int, max_parameters: int,
+                 baseline: Optional[Baseline] = None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.root_dir = root_dir
+        self.files = files
+        self.max_function_length = max_function_length
+        self.max_parameters = max_parameters
+        self.baseline = baseline or Baseline()
+
+        self.status = 'queued'  # queued -> running -> done
+        self.processed = 0
+        self.suppressed = 0
+        self.smells: List[Dict] = []
+        self.errors: List[Dict] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add_result(self, path: str, smells: Optional[List[Dict]] = None,
+                   error: Optional[str] = None, suppressed: int = 0) -> bool:
+        """
+        Record the outcome of one file.
+
+        Returns:
+            True once every file has a result; the job stays 'running'
+            until finish() is called
+        """
+        with self._lock:
+            self.suppressed += suppressed
+            if error is not None:
+                self.errors.append({'file': path, 'error': error})
+            for smell in smells or []:
+                smell['file'] = path
+                self.smells.append(smell)
+
+            self.processed += 1
+            self.status = 'running'
+            return self.processed == len(self.files)
+
+    def finish(self):
+        """Mark the job as done (after its files have been cleaned up)."""
+        with self._lock:
+            self.status = 'done'
+            self.finished_at = time.time()
+
+    def snapshot(self) -> Dict:
+        """
+        Consistent copy of the job state for display.
+
+        Returns:
+            Dictionary with status, progress and the findings so far
+        """
+        with self._lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'processed': self.processed,
+                'total': len(self.files),
+                'suppressed': self.suppressed,
+                'smells': list(self.smells),
+                'errors': list(self.errors),
+            }
+
+
+class AnalysisJobQueue:
+    """
+    Background job queue that analyzes uploaded projects file by file.
+
+    Files are scheduled round-robin across users, so a large upload
+    only gets its fair share of the workers while other users wait.
+    """
+
+    def __init__(self, num_workers: int = 4, classifier=None, keep_finished: float = 3600.0):
+        """
+        Args:
+            num_workers: Number of files analyzed in parallel
+            classifier: Optional SeverityClassifier used to add 'predicted_severity'
+            keep_finished: Seconds a finished job stays available for display
+        """
+        self.num_workers = num_workers
+        self.classifier = classifier
+        self.keep_finished = keep_finished
+
+        self._jobs: Dict[str, AnalysisJob] = {}
+        self._pending: 'OrderedDict[str, deque]' = OrderedDict()  # user_id -> (job, file) tasks
+        self._condition = threading.Condition()
+
+        # 'spawn' avoids forking the (multi-threaded) Streamlit server process
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+        self._threads = [
+            threading.Thread(target=self._worker, daemon=True, name=f"analysis-worker-{i}")
+            for i in range(num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, user_id: str, root_dir: str, files: List[str],
+               max_function_length: int = 20, max_parameters: int = 5,
+               baseline: Optional[Baseline] = None) -> str:
+        """
+        Queue a project for analysis.
+
+        Args:
+            user_id: Session identifier used for fair scheduling
+            root_dir: Directory the project was extracted to (removed when done)
+            files: Python files to analyze, relative to root_dir
+            baseline: Known findings to drop before classification
+
+        Returns:
+            Job id
+        """
+        job = AnalysisJob(user_id, root_dir, files, max_function_length, max_parameters, baseline)
+
+        with self._condition:
+            self._prune_finished()
+            self._jobs[job.id] = job
+            if not files:
+                self._cleanup(job)
+                job.finish()
+                return job.id
+
+            tasks = self._pending.setdefault(user_id, deque())
+            tasks.extend((job, path) for path in files)
+            self._condition.notify_all()
+
+        return job.id
+
+    def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        """Look up a job by id."""
+        return self._jobs.get(job_id)
+
+    def _prune_finished(self):
+        """Forget jobs that finished more than keep_finished seconds ago."""
+        cutoff = time.time() - self.keep_finished
+        for job_id in [j.id for j in self._jobs.values()
+                       if j.finished_at is not None and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _next_task(self):
+        """
+        Pop the next (job, file) task, rotating between users.
+
+        Must be called with the condition held.
+        """
+        user_id, tasks = self._pending.popitem(last=False)
+        task = tasks.popleft()
+        if tasks:
+            # Back of the line until every other user had a turn
+            self._pending[user_id] = tasks
+        return task
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                job, path = self._next_task()
+
+            try:
+                detected = self._executor.submit(
+                    _analyze_file, os.path.join(job.root_dir, path),
+                    job.max_function_length, job.max_parameters
+                ).result()
+
+                # Known findings are dropped before any further work
+                for smell in detected:
+                    smell['file'] = path
+                smells = job.baseline.filter(detected)
+
+                if self.classifier is not None:
+                    for smell in smells:
+                        smell['predicted_severity'] = self.classifier.predict_severity(smell)
+                finished = job.add_result(path, smells, suppressed=len(detected) - len(smells))
+            except Exception as e:
+                finished = job.add_result(path, error=str(e))
+
+            if finished:
+                # Only report 'done' once the extracted files are gone
+                self._cleanup(job)
+                job.finish()
+
+    def _cleanup(self, job: AnalysisJob):
+        """Remove the extracted project once its job is finished."""
+        shutil.rmtree(job.root_dir, ignore_errors=True)
+
+    def shutdown(self):
+        """Stop the worker processes (pending tasks are dropped)."""
+        with self._condition:
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -12,9 +12,15 @@ class SeverityClassifier:
     ML model to classify code smell severity using Logistic Regression.
     """
 
-    def __init__(self):
-        """Initialize the classifier and label encoder."""
-        self.model = LogisticRegression(
+    def __init__(self, model=None):
+        """
+        Initialize the classifier and label encoder.
+
+        Args:
+            model: Unfitted scikit-learn estimator (defaults to Logistic Regression),
+                e.g. the winner of ModelSelectionHarness
+        """
+        self.model = model if model is not None else LogisticRegression(
             max_iter=1000,
             random_state=42,
             multi_class='multinomial',  # For multi-class classification
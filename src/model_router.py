@@ -0,0 +1,158 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+# Model tiers, from most capable to cheapest/fastest.
+# latency_slo is the per-request budget in seconds; 'fallback' names the
+# tier to use when the budget is exceeded.
+DEFAULT_TIERS = {
+    'premium': {
+        'model': 'gpt-4o',
+        'max_tokens': 2000,
+        'prompt_variant': 'detailed',
+        'latency_slo': 40.0,
+        'fallback': 'standard',
+    },
+    'standard': {
+        'model': 'gpt-4o-mini',
+        'max_tokens': 1200,
+        'prompt_variant': 'standard',
+        'latency_slo': 20.0,
+        'fallback': 'fast',
+    },
+    'fast': {
+        'model': 'gpt-4o-mini',
+        'max_tokens': 500,
+        'prompt_variant': 'concise',
+        'latency_slo': 8.0,
+        'fallback': None,
+    },
+}
+
+# (smell type, predicted severity) -> tier. None acts as a wildcard.
+DEFAULT_ROUTING_TABLE = {
+    ('GodClass', 'high'): 'premium',
+    ('ComplexCondition', 'high'): 'premium',
+    ('TooManyParameters', None): 'fast',
+    (None, 'low'): 'fast',
+    (None, 'high'): 'standard',
+    (None, None): 'standard',
+}
+
+
+class ModelRouter:
+    """
+    Picks a model tier for each code smell and tracks per-tier latency and token usage.
+    """
+
+    def __init__(self, tiers: Optional[Dict] = None, routing_table: Optional[Dict] = None,
+                 cooldown: float = 60.0):
+        """
+        Args:
+            tiers: Tier configuration (defaults to DEFAULT_TIERS)
+            routing_table: (type, severity) -> tier mapping (defaults to DEFAULT_ROUTING_TABLE)
+            cooldown: Seconds a tier is skipped after exceeding its latency budget
+        """
+        self.tiers = tiers or DEFAULT_TIERS
+        self.routing_table = routing_table or DEFAULT_ROUTING_TABLE
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._degraded_until = {name: 0.0 for name in self.tiers}
+        self._stats = {name: self._empty_stats() for name in self.tiers}
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
+            'requests': 0,
+            'budget_exceeded': 0,
+            'errors': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'latencies': deque(maxlen=1000),
+        }
+
+    def select_tier(self, smell: Dict) -> str:
+        """
+        Look up the configured tier for a smell, ignoring degraded tiers.
+
+        Args:
+            smell: Dictionary containing code smell information
+
+        Returns:
+            Name of the tier to call
+        """
+        smell_type = smell.get('type')
+        severity = smell.get('predicted_severity', smell.get('severity'))
+
+        tier = None
+        for key in ((smell_type, severity), (smell_type, None), (None, severity), (None, None)):
+            if key in self.routing_table:
+                tier = self.routing_table[key]
+                break
+        if tier is None:
+            tier = next(iter(self.tiers))
+
+        # Skip tiers that recently blew their latency budget
+        now = time.monotonic()
+        with self._lock:
+            while self._degraded_until.get(tier, 0.0) > now and self.tiers[tier]['fallback']:
+                tier = self.tiers[tier]['fallback']
+
+        return tier
+
+    def fallback_for(self, tier: str) -> Optional[str]:
+        """Return the next cheaper/faster tier, or None."""
+        return self.tiers[tier]['fallback']
+
+    def record(self, tier: str, latency: float, prompt_tokens: int = 0,
+               completion_tokens: int = 0, timed_out: bool = False, failed: bool = False):
+        """
+        Record the outcome of one request.
+
+        A request that timed out or took longer than the tier's latency_slo
+        puts the tier into cooldown, so select_tier() falls back for a while.
+        Failed requests (rate limits, server errors) are counted as errors
+        but kept out of the latency figures.
+        """
+        exceeded = timed_out or latency > self.tiers[tier]['latency_slo']
+
+        with self._lock:
+            stats = self._stats[tier]
+            stats['requests'] += 1
+            if failed:
+                stats['errors'] += 1
+                return
+            stats['prompt_tokens'] += prompt_tokens
+            stats['completion_tokens'] += completion_tokens
+            stats['latencies'].append(latency)
+            if exceeded:
+                stats['budget_exceeded'] += 1
+                self._degraded_until[tier] = time.monotonic() + self.cooldown
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Summarize observed latency and token usage per tier.
+
+        Returns:
+            Dictionary of tier name -> summary metrics
+        """
+        summary = {}
+        with self._lock:
+            for name, stats in self._stats.items():
+                latencies: List[float] = sorted(stats['latencies'])
+                summary[name] = {
+                    'model': self.tiers[name]['model'],
+                    'requests': stats['requests'],
+                    'budget_exceeded': stats['budget_exceeded'],
+                    'errors': stats['errors'],
+                    'prompt_tokens': stats['prompt_tokens'],
+                    'completion_tokens': stats['completion_tokens'],
+                    'mean_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'p95_latency': latencies[math.ceil(0.95 * len(latencies)) - 1] if latencies else 0.0,
+                    'latency_slo': self.tiers[name]['latency_slo'],
+                }
+        return summary
@@ -0,0 +1,155 @@
+import pickle
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeClassifier
+from src.ml_classifier import SeverityClassifier
+
+
+def default_candidates() -> Dict:
+    """Candidate models compared by default."""
+    return {
+        'logistic_regression': LogisticRegression(max_iter=1000, random_state=42),
+        'decision_tree': DecisionTreeClassifier(max_depth=5, random_state=42),
+        'random_forest': RandomForestClassifier(n_estimators=50, random_state=42),
+        'knn': KNeighborsClassifier(n_neighbors=3),
+    }
+
+
+def _fit_and_score(model, X: np.ndarray, y: np.ndarray, train_idx: np.ndarray,
+                   test_idx: np.ndarray) -> float:
+    """Fit a fresh copy of the model on one fold and return its test accuracy."""
+    fold_model = clone(model)
+    fold_model.fit(X[train_idx], y[train_idx])
+    return accuracy_score(y[test_idx], fold_model.predict(X[test_idx]))
+
+
+class ModelSelectionHarness:
+    """
+    Compares candidate severity models with k-fold cross-validation
+    and measures their inference latency and size.
+    """
+
+    def __init__(self, candidates: Optional[Dict] = None, n_splits: int = 5,
+                 n_jobs: int = -1, latency_budget_ms: Optional[float] = None,
+                 batch_size: int = 1000, repeats: int = 50):
+        """
+        Args:
+            candidates: Mapping of name -> unfitted scikit-learn estimator
+            n_splits: Number of cross-validation folds
+            n_jobs: Worker processes for cross-validation (-1 = all cores)
+            latency_budget_ms: Per-smell prediction budget used for ranking
+            batch_size: Number of smells in the batch latency measurement
+            repeats: Number of timed predictions per latency measurement
+        """
+        self.candidates = candidates or default_candidates()
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.latency_budget_ms = latency_budget_ms
+        self.batch_size = batch_size
+        self.repeats = repeats
+
+    def evaluate(self, training_data: List[Dict]) -> List[Dict]:
+        """
+        Cross-validate every candidate and measure its inference cost.
+
+        Args:
+            training_data: List of code smell dictionaries with 'severity' labels
+
+        Returns:
+            List of result dictionaries, ranked best first
+        """
+        extractor = SeverityClassifier()
+        X = np.array([extractor.extract_features(smell) for smell in training_data])
+        y = LabelEncoder().fit_transform([smell['severity'] for smell in training_data])
+
+        folds = list(StratifiedKFold(
+            n_splits=self.n_splits, shuffle=True, random_state=42
+        ).split(X, y))
+
+        # One task per (candidate, fold) so all cores stay busy
+        tasks = [(name, train_idx, test_idx)
+                 for name in self.candidates
+                 for train_idx, test_idx in folds]
+        scores = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_score)(self.candidates[name], X, y, train_idx, test_idx)
+            for name, train_idx, test_idx in tasks
+        )
+
+        fold_scores: Dict[str, List[float]] = {name: [] for name in self.candidates}
+        for (name, _, _), score in zip(tasks, scores):
+            fold_scores[name].append(score)
+
+        # Latency is measured sequentially so parallel load doesn't skew it
+        results = []
+        for name, model in self.candidates.items():
+            fitted = clone(model).fit(X, y)
+            results.append({
+                'name': name,
+                'accuracy_mean': float(np.mean(fold_scores[name])),
+                'accuracy_std': float(np.std(fold_scores[name])),
+                'fold_scores': fold_scores[name],
+                'single_latency_ms': self._single_latency_ms(fitted, X),
+                'batch_latency_ms': self._batch_latency_ms(fitted, X),
+                'model_size_bytes': len(pickle.dumps(fitted)),
+            })
+
+        return self._rank(results)
+
+    def _single_latency_ms(self, model, X: np.ndarray) -> float:
+        """Median time to predict one smell, in milliseconds."""
+        row = X[:1]
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            model.predict(row)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    def _batch_latency_ms(self, model, X: np.ndarray) -> float:
+        """Median time to predict a batch of batch_size smells, in milliseconds."""
+        batch = np.resize(X, (self.batch_size, X.shape[1]))
+        timings = []
+        for _ in range(max(1, self.repeats // 10)):
+            start = time.perf_counter()
+            model.predict(batch)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    def _rank(self, results: List[Dict]) -> List[Dict]:
+        """
+        Order results: models within the latency budget first,
+        then by accuracy, then by single-item latency.
+        """
+        for result in results:
+            result['meets_budget'] = (
+                self.latency_budget_ms is None
+                or result['single_latency_ms'] <= self.latency_budget_ms
+            )
+
+        return sorted(
+            results,
+            key=lambda r: (not r['meets_budget'], -r['accuracy_mean'], r['single_latency_ms'])
+        )
+
+    def print_report(self, results: List[Dict]):
+        """Print a ranked comparison table."""
+        print(f"\n📊 Model comparison ({self.n_splits}-fold cross-validation)")
+        if self.latency_budget_ms is not None:
+            print(f"Latency budget: {self.latency_budget_ms:.3f} ms per smell")
+        print(f"{'#':<3}{'Model':<22}{'Accuracy':>16}{'Single (ms)':>14}"
+              f"{f'Batch {self.batch_size} (ms)':>18}{'Size (KB)':>12}  Budget")
+
+        for rank, r in enumerate(results, 1):
+            accuracy = f"{r['accuracy_mean'] * 100:.1f}% ± {r['accuracy_std'] * 100:.1f}"
+            print(f"{rank:<3}{r['name']:<22}{accuracy:>16}{r['single_latency_ms']:>14.3f}"
+                  f"{r['batch_latency_ms']:>18.3f}{r['model_size_bytes'] / 1024:>12.1f}  "
+                  f"{'✅' if r['meets_budget'] else '❌'}")
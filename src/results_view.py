@@ -0,0 +1,66 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+SORT_OPTIONS = {
+    'Severity': lambda s: (SEVERITY_ORDER.get(get_severity(s), 3), s.get('line') or 0),
+    'Line': lambda s: (s.get('line') or 0,),
+    'Type': lambda s: (s.get('type', ''), s.get('line') or 0),
+    'Name': lambda s: (s.get('name') or '', s.get('line') or 0),
+}
+
+
+def get_severity(smell: Dict) -> str:
+    """Severity shown to the user: ML prediction if available, else the detector's."""
+    return smell.get('predicted_severity', smell.get('severity', 'unknown'))
+
+
+def build_view(smells: List[Dict], severities: Optional[Sequence[str]] = None,
+               types: Optional[Sequence[str]] = None, name_query: str = '',
+               sort_by: str = 'Severity') -> List[int]:
+    """
+    Filter and sort findings.
+
+    Args:
+        smells: All findings of the current analysis
+        severities: Severities to keep (None keeps all)
+        types: Smell types to keep (None keeps all)
+        name_query: Case-insensitive substring of the function/class name
+        sort_by: One of SORT_OPTIONS
+
+    Returns:
+        Indices into smells, in display order
+    """
+    query = name_query.strip().lower()
+    severities = set(severities) if severities is not None else None
+    types = set(types) if types is not None else None
+
+    indices = [
+        i for i, smell in enumerate(smells)
+        if (severities is None or get_severity(smell) in severities)
+        and (types is None or smell.get('type') in types)
+        and (not query or query in (smell.get('name') or '').lower())
+    ]
+
+    sort_key = SORT_OPTIONS[sort_by]
+    indices.sort(key=lambda i: sort_key(smells[i]))
+    return indices
+
+
+def paginate(indices: List[int], page: int, page_size: int) -> Tuple[List[int], int]:
+    """
+    Slice one page out of a result view.
+
+    Args:
+        indices: Display-ordered indices from build_view()
+        page: 1-based page number (clamped to the valid range)
+        page_size: Findings per page
+
+    Returns:
+        (indices on the page, total number of pages)
+    """
+    num_pages = max(1, math.ceil(len(indices) / page_size))
+    page = min(max(page, 1), num_pages)
+    start = (page - 1) * page_size
+    return indices[start:start + page_size], num_pages
@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import json
+import os
+import socket
+import time
+from typing import Dict, List, Optional
+from src.ast_analyzer import CodeSmellDetector
+from src.baseline import Baseline
+from src.findings_store import FindingsStore
+
+MANIFEST_VERSION = 2
+
+
+def _path_hash(path: str) -> int:
+    """Stable hash of a file path (Python's hash() is salted per process)."""
+    return int(hashlib.sha1(path.encode('utf-8')).hexdigest()[:16], 16)
+
+
+def input_digest(paths: List[str]) -> str:
+    """Digest of a file list, independent of order and duplicates."""
+    return hashlib.sha1('\n'.join(sorted(set(paths))).encode('utf-8')).hexdigest()
+
+
+def shard_files(paths: List[str], num_shards: int, strategy: str = 'hash',
+                sizes: Optional[Dict[str, int]] = None) -> List[List[str]]:
+    """
+    Split a file list into deterministic shards.
+
+    Args:
+        paths: Files to analyze
+        num_shards: Number of shards (workers / nodes)
+        strategy: 'hash' (by path hash) or 'size' (greedy size balancing)
+        sizes: Optional file sizes in bytes for 'size'; read from disk if missing
+
+    Returns:
+        List of num_shards sorted file lists
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be at least 1")
+
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    unique_paths = sorted(set(paths))
+
+    if strategy == 'hash':
+        for path in unique_paths:
+            shards[_path_hash(path) % num_shards].append(path)
+
+    elif strategy == 'size':
+        if sizes is None:
+            # Unreadable files count as empty; run_shard() reports them
+            sizes = {path: os.path.getsize(path) if os.path.isfile(path) else 0
+                     for path in unique_paths}
+
+        # Largest files first, each onto the currently lightest shard.
+        # Ties are broken by path and shard index so every node agrees.
+        loads = [0] * num_shards
+        for path in sorted(unique_paths, key=lambda p: (-sizes[p], p)):
+            target = min(range(num_shards), key=lambda i: (loads[i], i))
+            shards[target].append(path)
+            loads[target] += sizes[path]
+
+    else:
+        raise ValueError(f"Unknown sharding strategy '{strategy}'")
+
+    return [sorted(shard) for shard in shards]
+
+
+def run_shard(paths: List[str], shard_index: int, num_shards: int, output_path: str,
+              strategy: str = 'hash', max_function_length: int = 20,
+              max_parameters: int = 5, baseline_path: Optional[str] = None) -> Dict:
+    """
+    Analyze one shard of a file list and write a partial result manifest.
+
+    Every node is given the full file list and picks its own shard,
+    so no coordination is needed beyond agreeing on the arguments.
+
+    Args:
+        paths: Full list of files to analyze
+        shard_index: Shard handled by this worker (0-based)
+        num_shards: Total number of shards
+        output_path: Where to write the manifest JSON
+        strategy: Sharding strategy, see shard_files()
+        max_function_length: Detector threshold
+        max_parameters: Detector threshold
+        baseline_path: Baseline file of known findings to skip
+
+    Returns:
+        The manifest that was written
+    """
+    shard = shard_files(paths, num_shards, strategy)[shard_index]
+    detector = CodeSmellDetector(
+        max_function_length=max_function_length,
+        max_parameters=max_parameters
+    )
+    baseline = Baseline.load(baseline_path) if baseline_path else Baseline()
+
+    start = time.perf_counter()
+    files = []
+    smells = []
+    suppressed = 0
+
+    for path in shard:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read()
+        except OSError as e:
+            # Record the failure instead of losing the whole shard
+            files.append({'path': path, 'error': str(e)})
+            continue
+
+        detected = detector.analyze_code(source)
+        for smell in detected:
+            smell['file'] = path
+        file_smells = baseline.filter(detected)
+        suppressed += len(detected) - len(file_smells)
+        smells.extend(file_smells)
+
+        files.append({
+            'path': path,
+            'sha1': hashlib.sha1(source.encode('utf-8')).hexdigest(),
+            'smells': len(file_smells),
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'shard_index': shard_index,
+        'num_shards': num_shards,
+        'strategy': strategy,
+        # Shards of different file lists must not be merged
+        'input_digest': input_digest(paths),
+        'config': {
+            'max_function_length': max_function_length,
+            'max_parameters': max_parameters,
+        },
+        'host': socket.gethostname(),
+        'elapsed_seconds': time.perf_counter() - start,
+        'suppressed': suppressed,
+        'files': files,
+        'smells': smells,
+    }
+
+    # Write atomically so a merge never sees a half-written manifest
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, output_path)
+
+    return manifest
+
+
+def merge_manifests(manifest_paths: List[str]) -> Dict:
+    """
+    Combine shard manifests into one report.
+
+    Findings are deduplicated on (file, type, name, line) and sorted
+    by file and line, so the result doesn't depend on the order in
+    which shards finished. Files that couldn't be read are listed
+    under 'errors'. Shards must agree on the sharding arguments and
+    on the input file list (by digest), otherwise files could be
+    silently missing from the report.
+
+    Args:
+        manifest_paths: Partial result files written by run_shard()
+
+    Returns:
+        Merged report dictionary
+    """
+    manifests = []
+    for path in manifest_paths:
+        with open(path, 'r') as f:
+            manifests.append(json.load(f))
+
+    if not manifests:
+        raise ValueError("No manifests to merge")
+
+    for manifest in manifests:
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+
+    first = manifests[0]
+    for manifest in manifests[1:]:
+        for key in ('num_shards', 'strategy', 'input_digest', 'config'):
+            if manifest[key] != first[key]:
+                raise ValueError(f"Manifests disagree on '{key}'")
+
+    seen_shards = {m['shard_index'] for m in manifests}
+    missing = sorted(set(range(first['num_shards'])) - seen_shards)
+
+    files = {}
+    for manifest in manifests:
+        for entry in manifest['files']:
+            files[entry['path']] = entry
+
+    smells = {}
+    for manifest in manifests:
+        for smell in manifest['smells']:
+            key = (smell.get('file'), smell.get('type'), smell.get('name'), smell.get('line'))
+            smells.setdefault(key, smell)
+
+    ordered_smells = sorted(
+        smells.values(),
+        key=lambda s: (s.get('file') or '', s.get('line') or 0, s.get('type') or '', s.get('name') or '')
+    )
+
+    return {
+        'version': MANIFEST_VERSION,
+        'num_shards': first['num_shards'],
+        'strategy': first['strategy'],
+        'input_digest': first['input_digest'],
+        'config': first['config'],
+        'missing_shards': missing,
+        'suppressed': sum(m.get('suppressed', 0) for m in manifests),
+        'errors': [
+            {'path': path, 'error': files[path]['error']}
+            for path in sorted(files) if 'error' in files[path]
+        ],
+        'files': [files[path] for path in sorted(files)],
+        'smells': ordered_smells,
+    }
+
+
+def _read_file_list(list_path: str) -> List[str]:
+    with open(list_path, 'r') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded code smell scan")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser('scan', help="Analyze one shard of a file list")
+    scan.add_argument('file_list', help="Text file with one path per line")
+    scan.add_argument('--shard-index', type=int, required=True)
+    scan.add_argument('--num-shards', type=int, required=True)
+    scan.add_argument('--strategy', choices=['hash', 'size'], default='hash')
+    scan.add_argument('--max-function-length', type=int, default=20)
+    scan.add_argument('--max-parameters', type=int, default=5)
+    scan.add_argument('--baseline', help="Baseline file of known findings to skip")
+    scan.add_argument('--output', required=True)
+
+    merge = subparsers.add_parser('merge', help="Merge shard manifests into one report")
+    merge.add_argument('manifests', nargs='+')
+    merge.add_argument('--output', required=True)
+    merge.add_argument('--db', help="Findings database to store the merged findings in")
+    merge.add_argument('--commit', help="Commit the scanned tree belongs to (required with --db)")
+    merge.add_argument('--write-baseline', metavar='PATH',
+                       help="Write a baseline accepting all merged findings")
+    merge.add_argument('--baseline',
+                       help="Baseline the shards were scanned with, kept in --write-baseline")
+
+    args = parser.parse_args()
+
+    if args.command == 'merge' and args.db and not args.commit:
+        parser.error("--commit is required with --db")
+
+    if args.command == 'scan':
+        manifest = run_shard(
+            _read_file_list(args.file_list), args.shard_index, args.num_shards,
+            args.output, args.strategy, args.max_function_length, args.max_parameters,
+            args.baseline
+        )
+        print(f"Shard {args.shard_index}/{args.num_shards}: "
+              f"{len(manifest['files'])} files, {len(manifest['smells'])} smells")
+    else:
+        report = merge_manifests(args.manifests)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        if report['missing_shards']:
+            print(f"⚠️ Missing shards: {report['missing_shards']}")
+        for error in report['errors']:
+            print(f"⚠️ Could not analyze {error['path']}: {error['error']}")
+        print(f"Merged {len(report['files'])} files, {len(report['smells'])} smells")
+
+        if args.db:
+            store = FindingsStore(args.db)
+            stored = store.add_findings(report['smells'], commit_sha=args.commit)
+            store.close()
+            print(f"Stored {stored} findings for commit {args.commit} in {args.db}")
+
+        if args.write_baseline:
+            # Suppressed findings aren't in the report, so keep the old baseline's
+            known = Baseline.load(args.baseline) if args.baseline else Baseline()
+            new_baseline = known.extended(report['smells'])
+            new_baseline.save(args.write_baseline)
+            print(f"Wrote baseline with {len(new_baseline)} finding(s) to {args.write_baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import ast
+from typing import Dict, List, Optional
+from src.ast_analyzer import qualified_names
+
+
+class TemplateSuggestionEngine:
+    """
+    Builds refactoring suggestions locally from a smell and the function's AST,
+    without calling the LLM.
+    """
+
+    SUPPORTED_TYPES = ('TooManyParameters', 'LongFunction')
+
+    def supports(self, smell: Dict) -> bool:
+        """Return True if a template exists for this smell type."""
+        return smell.get('type') in self.SUPPORTED_TYPES
+
+    def generate_suggestion(self, smell: Dict, source_code: Optional[str] = None) -> Optional[str]:
+        """
+        Generate a template-based suggestion for a code smell.
+
+        Args:
+            smell: Dictionary containing code smell information
+            source_code: Source the smell was detected in (needed for AST details)
+
+        Returns:
+            Markdown suggestion, or None if the smell type isn't covered
+            or the function can't be located in the source
+        """
+        if not self.supports(smell) or not source_code:
+            return None
+
+        node = self._find_function(source_code, smell)
+        if node is None:
+            return None
+
+        if smell['type'] == 'TooManyParameters':
+            return self._suggest_parameter_object(node)
+        return self._suggest_extract_method(node)
+
+    def _find_function(self, source_code: str, smell: Dict) -> Optional[ast.FunctionDef]:
+        """
+        Locate the function a smell refers to.
+
+        Matches on name and line first, then on the qualified name. A bare
+        name that several functions share (e.g. __init__) is ambiguous and
+        returns None, leaving the smell to the LLM.
+        """
+        try:
+            tree = ast.parse(source_code)
+        except SyntaxError:
+            return None
+
+        name = smell.get('name')
+        candidates = [
+            n for n in ast.walk(tree)
+            if isinstance(n, ast.FunctionDef) and n.name == name
+        ]
+        for node in candidates:
+            if node.lineno == smell.get('line'):
+                return node
+
+        if smell.get('qualname'):
+            qualnames = qualified_names(tree)
+            candidates = [n for n in candidates if qualnames[n] == smell['qualname']]
+
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _suggest_parameter_object(self, node: ast.FunctionDef) -> str:
+        """Propose grouping the parameters of a function into a dataclass."""
+        params = [arg.arg for arg in node.args.args]
+        leading = [p for p in params if p in ('self', 'cls')]
+        grouped = [p for p in params if p not in ('self', 'cls')]
+
+        # Keep the first parameter (usually an identifier) outside the group
+        kept = leading + grouped[:1]
+        grouped = grouped[1:]
+
+        class_name = ''.join(part.capitalize() for part in node.name.split('_') if part) + 'Params'
+        fields = "\n".join(
+            f"    {p}: {self._annotation(node, p)}" for p in grouped
+        )
+        new_signature = ", ".join(kept + [f"params: {class_name}"])
+        accesses = "\n".join(f"    {p} = params.{p}" for p in grouped[:3])
+        imports = "from dataclasses import dataclass"
+        if ': Any' in fields:
+            imports += "\nfrom typing import Any"
+
+        return f"""## Issue Analysis
+`{node.name}` takes {len(params)} parameters. Long parameter lists are hard to call correctly and tend to grow further.
+
+## Why This Matters
+Callers must remember the order of {len(grouped)} related arguments, and every new field changes the signature of `{node.name}` and all of its call sites.
+
+## Suggested Refactoring
+Introduce a parameter object: group `{', '.join(grouped)}` into a `{class_name}` dataclass and pass it as a single argument.
+
+## Code Example
+```python
+{imports}
+
+
+@dataclass
+class {class_name}:
+{fields}
+
+
+def {node.name}({new_signature}):
+{accesses}
+    ...
+```
+
+## Additional Best Practices
+- Give the dataclass a domain name if one fits better than `{class_name}`
+- Consider `frozen=True` if the values are never modified
+- Move behaviour that only uses these fields onto the new class
+"""
+
+    def _annotation(self, node: ast.FunctionDef, param: str) -> str:
+        """Return the source annotation of a parameter, or 'Any'."""
+        for arg in node.args.args:
+            if arg.arg == param and arg.annotation is not None:
+                return ast.unparse(arg.annotation)
+        return 'Any'
+
+    def _suggest_extract_method(self, node: ast.FunctionDef) -> str:
+        """Propose extract-method candidates from the function's statement blocks."""
+        blocks = self._statement_blocks(node.body)
+        body_statements = len(node.body)
+
+        candidate_lines = []
+        for i, block in enumerate(blocks, 1):
+            start, end = block[0].lineno, block[-1].end_lineno
+            assigned = self._assigned_names(block)
+            outputs = f" → returns `{', '.join(assigned[:3])}`" if assigned else ""
+            plural = 's' if len(block) != 1 else ''
+            candidate_lines.append(
+                f"{i}. Lines {start}-{end} ({len(block)} statement{plural}, "
+                f"{self._describe_block(block)}){outputs}"
+            )
+
+        candidates = "\n".join(candidate_lines) or "No separable blocks found; split by responsibility."
+        helpers = "\n".join(
+            f"    _{node.name}_step_{i}(...)" for i in range(1, min(len(blocks), 3) + 1)
+        )
+
+        return f"""## Issue Analysis
+`{node.name}` has {body_statements} top-level statements, which usually means it handles more than one responsibility.
+
+## Why This Matters
+Long functions are harder to read, test and change safely. Each extracted helper can be named, tested and reused on its own.
+
+## Suggested Refactoring
+Apply *Extract Method* to these statement blocks:
+
+{candidates}
+
+## Code Example
+```python
+def {node.name}(...):
+{helpers}
+```
+
+## Additional Best Practices
+- Name each helper after what it does, not where it came from
+- Pass values in and return results instead of sharing mutable state
+- Add tests for the helpers before removing the original code
+"""
+
+    def _statement_blocks(self, body: List[ast.stmt], max_block: int = 8) -> List[List[ast.stmt]]:
+        """
+        Split a function body into contiguous blocks of the same kind of statement.
+
+        Compound statements (if/for/while/with/try) each form their own block,
+        runs of simple statements are grouped up to max_block statements.
+        """
+        compound = (ast.If, ast.For, ast.While, ast.With, ast.Try)
+        blocks: List[List[ast.stmt]] = []
+        current: List[ast.stmt] = []
+
+        for stmt in body:
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                continue  # Docstrings
+            if isinstance(stmt, compound):
+                if current:
+                    blocks.append(current)
+                    current = []
+                blocks.append([stmt])
+            else:
+                current.append(stmt)
+                if len(current) >= max_block:
+                    blocks.append(current)
+                    current = []
+
+        if current:
+            blocks.append(current)
+
+        return blocks
+
+    def _assigned_names(self, block: List[ast.stmt]) -> List[str]:
+        """Names assigned inside a block, in order of first assignment."""
+        names: List[str] = []
+        for stmt in block:
+            for n in ast.walk(stmt):
+                if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store) and n.id not in names:
+                    names.append(n.id)
+        return names
+
+    def _describe_block(self, block: List[ast.stmt]) -> str:
+        """Short human description of a statement block."""
+        kind = type(block[0]).__name__.lower()
+        if len(block) == 1 and kind in ('if', 'for', 'while', 'with', 'try'):
+            return f"`{kind}` block"
+        return "sequential statements"
@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Inline `code` spans and fenced code blocks of a markdown suggestion
+CODE_SPAN = re.compile(r"```.*?```|`[^`\n]+`", re.DOTALL)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word and number tokens, splitting snake_case and CamelCase."""
+    text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text)
+    return re.findall(r'[a-z]+|\d+', text.lower())
+
+
+def similarity_text(smell: Dict) -> str:
+    """
+    Text a smell is indexed under: type, severity and message, with the line
+    number left out and the function/class name masked, so smells that only
+    differ in location or name map to the same vector.
+    """
+    severity = smell.get('predicted_severity', smell.get('severity', 'unknown'))
+    message = smell.get('message', '')
+    if smell.get('name'):
+        message = re.sub(rf"\b{re.escape(smell['name'])}\b", 'NAME', message)
+    return f"{smell.get('type', 'Unknown')} {severity} {message}"
+
+
+def similarity_group(smell: Dict) -> str:
+    """
+    Group a smell's suggestions are matched in: its type and exact size
+    metric, so a function with 24 parameters never reuses the answer
+    written for one with 6.
+    """
+    metric = smell.get('metric')
+    if metric is None:
+        # Older smell dicts only carry the number in the message
+        numbers = re.findall(r'\b\d+\b', smell.get('message', ''))
+        metric = numbers[0] if numbers else ''
+    return f"{smell.get('type', 'Unknown')}:{metric}"
+
+
+class SuggestionIndex:
+    """
+    Local nearest-neighbour index over past prompts and their AI suggestions.
+
+    Texts are embedded as hashed token n-gram vectors (no model, no network),
+    so a smell that only differs in its function name can reuse the
+    suggestion generated for an earlier one.
+    """
+
+    def __init__(self, dim: int = 1024, max_size: int = 5000, threshold: float = 0.9,
+                 ngram_range: Tuple[int, int] = (1, 2)):
+        """
+        Args:
+            dim: Number of hash buckets per vector
+            max_size: Maximum number of stored suggestions (least recently used are evicted)
+            threshold: Minimum cosine similarity for a stored suggestion to be reused
+            ngram_range: Smallest and largest token n-gram used as a feature
+        """
+        self.dim = dim
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ngram_range = ngram_range
+
+        self.vectors = np.zeros((max_size, dim), dtype=np.float32)
+        self.last_used = np.zeros(max_size, dtype=np.int64)
+        self.group_codes = np.zeros(max_size, dtype=np.int32)
+        self.entries: List[Optional[Dict]] = [None] * max_size
+        self.size = 0
+
+        self._group_ids: Dict[str, int] = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def _group_code(self, group: str) -> int:
+        """Integer id of a group, so matching is a vectorized comparison."""
+        return self._group_ids.setdefault(group, len(self._group_ids))
+
+    def vectorize(self, text: str) -> np.ndarray:
+        """
+        Embed a text as an L2-normalized hashed n-gram vector.
+
+        Args:
+            text: Prompt or smell description
+
+        Returns:
+            float32 vector of length dim
+        """
+        tokens = tokenize(text)
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                h = zlib.crc32(' '.join(tokens[i:i + n]).encode('utf-8'))
+                # Signed hashing keeps bucket collisions from always adding up
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def query(self, text: str, group: str = '') -> Optional[Dict]:
+        """
+        Find the most similar stored suggestion.
+
+        Args:
+            text: Prompt or smell description
+            group: Only entries added with the same group can match (e.g. smell type)
+
+        Returns:
+            Stored entry with an added 'score', or None below the threshold
+        """
+        vector = self.vectorize(text)
+
+        with self._lock:
+            if self.size == 0:
+                return None
+
+            if group not in self._group_ids:
+                return None
+
+            scores = self.vectors[:self.size] @ vector
+            scores[self.group_codes[:self.size] != self._group_ids[group]] = -1.0
+
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            self._clock += 1
+            self.last_used[best] = self._clock
+            return dict(self.entries[best], score=float(scores[best]))
+
+    def add(self, text: str, suggestion: str, group: str = '', name: Optional[str] = None):
+        """
+        Store a suggestion, evicting the least recently used entry when full.
+
+        An entry stored for the same text and group is replaced, so a
+        regenerated suggestion takes the place of the old one.
+
+        Args:
+            text: Prompt or smell description the suggestion was generated for
+            suggestion: The generated suggestion
+            group: Matching group, see query()
+            name: Function/class name in the suggestion, replaced when it's reused
+        """
+        vector = self.vectorize(text)
+
+        with self._lock:
+            existing = None
+            if self.size and group in self._group_ids:
+                same_group = self.group_codes[:self.size] == self._group_ids[group]
+                scores = np.where(same_group, self.vectors[:self.size] @ vector, -1.0)
+                best = int(np.argmax(scores))
+                if scores[best] > 0.9999:
+                    existing = best
+
+            if existing is not None:
+                slot = existing
+            elif self.size < self.max_size:
+                slot = self.size
+                self.size += 1
+            else:
+                slot = int(np.argmin(self.last_used))
+
+            self._clock += 1
+            self.vectors[slot] = vector
+            self.last_used[slot] = self._clock
+            self.group_codes[slot] = self._group_code(group)
+            self.entries[slot] = {'group': group, 'name': name, 'suggestion': suggestion}
+
+    @staticmethod
+    def adapt(entry: Dict, name: Optional[str]) -> str:
+        """
+        Rewrite a stored suggestion for a different function/class name.
+
+        Only code spans and code blocks are rewritten, so a name that is
+        also an ordinary word ("load") is left alone in the prose.
+
+        Args:
+            entry: Result of query()
+            name: Name of the smell the suggestion is reused for
+
+        Returns:
+            Suggestion text with the original name replaced
+        """
+        suggestion = entry['suggestion']
+        if entry.get('name') and name and entry['name'] != name:
+            pattern = re.compile(rf"\b{re.escape(entry['name'])}\b")
+            suggestion = CODE_SPAN.sub(
+                lambda code: pattern.sub(lambda _: name, code.group(0)), suggestion
+            )
+        return suggestion
+
+    def save(self, filepath: str):
+        """Save index to disk (.npz), replacing any previous file atomically."""
+        tmp_path = filepath + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'wb') as f:
+                # Passing a file object keeps numpy from appending '.npz'
+                np.savez_compressed(
+                    f,
+                    vectors=self.vectors[:self.size],
+                    last_used=self.last_used[:self.size],
+                    entries=np.array(json.dumps(self.entries[:self.size])),
+                    config=np.array(json.dumps({
+                        'dim': self.dim,
+                        'max_size': self.max_size,
+                        'threshold': self.threshold,
+                        'ngram_range': list(self.ngram_range),
+                    }))
+                )
+            os.replace(tmp_path, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'SuggestionIndex':
+        """Load index from disk."""
+        with np.load(filepath, allow_pickle=False) as data:
+            config = json.loads(str(data['config']))
+            index = cls(
+                dim=config['dim'],
+                max_size=config['max_size'],
+                threshold=config['threshold'],
+                ngram_range=tuple(config['ngram_range'])
+            )
+            entries = json.loads(str(data['entries']))
+
+            index.size = len(entries)
+            index.vectors[:index.size] = data['vectors']
+            index.last_used[:index.size] = data['last_used']
+            index.entries[:index.size] = entries
+            for i, entry in enumerate(entries):
+                index.group_codes[i] = index._group_code(entry['group'])
+            index._clock = int(index.last_used.max()) if index.size else 0
+
+        return index
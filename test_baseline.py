@@ -0,0 +1,53 @@
+from src.ast_analyzer import CodeSmellDetector
+from src.baseline import Baseline, fingerprint
+
+# Read and analyze code
+with open('test_code.py', 'r') as f:
+    code = f.read()
+
+detector = CodeSmellDetector()
+baseline = Baseline.from_smells(detector.analyze_code(code))
+
+# Shifting everything down and growing a long function slightly keeps the findings known
+shifted_code = "\n\n\n" + code.replace(
+    '        statement_21 = "line"',
+    '        statement_21 = "line"\n        statement_22 = "line"'
+)
+assert baseline.filter(detector.analyze_code(shifted_code)) == []
+
+# A new finding is still reported
+new_code = shifted_code + """
+
+def create_order(order_id, customer, items, address, coupon, notes):
+    pass
+"""
+new_smells = baseline.filter(detector.analyze_code(new_code))
+assert [smell['name'] for smell in new_smells] == ['create_order']
+
+# Metrics are floor-bucketed: growth within a bucket keeps the fingerprint,
+# crossing into the next bucket (24 -> 25 statements) reports the finding again
+long_function = {'file': 'app.py', 'type': 'LongFunction', 'qualname': 'run'}
+assert fingerprint(dict(long_function, metric=21)) == fingerprint(dict(long_function, metric=24))
+assert fingerprint(dict(long_function, metric=24)) != fingerprint(dict(long_function, metric=25))
+
+# The file is part of the fingerprint
+assert fingerprint(dict(long_function, metric=21)) != fingerprint(dict(long_function, metric=21, file=''))
+
+# Extending a baseline keeps the findings it already accepted
+extended = baseline.extended(new_smells)
+assert extended.fingerprints == baseline.fingerprints | Baseline.from_smells(new_smells).fingerprints
+assert extended.filter(detector.analyze_code(new_code)) == []
+
+# Round trip through the baseline file format
+assert Baseline.loads(baseline.dumps()).fingerprints == baseline.fingerprints
+
+# Malformed baseline files are rejected with ValueError
+for bad in ('[]', '{"version": 1, "fingerprints": 5}', '{"version": 1}',
+            '{"version": 1, "fingerprints": [1, 2]}', '{"version": 2, "fingerprints": []}', 'not json'):
+    try:
+        Baseline.loads(bad)
+        raise AssertionError(f"accepted {bad}")
+    except ValueError:
+        pass
+
+print(f"Baseline with {len(baseline)} finding(s), new: {[s['message'] for s in new_smells]}")
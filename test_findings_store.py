@@ -0,0 +1,58 @@
+from src.findings_store import FindingsStore
+
+# In-memory store for a quick check
+store = FindingsStore(':memory:')
+
+base_smells = [
+    {'type': 'TooManyParameters', 'name': 'process_user_data', 'line': 1,
+     'message': 'Function process_user_data has 9 parameters (recommended: max 5)', 'severity': 'low'},
+    {'type': 'LongFunction', 'name': 'update_user', 'line': 9,
+     'message': 'Function update_user has 21 statements (recommended: max 20)', 'severity': 'medium'},
+]
+
+# Same findings moved down a few lines, one fixed and one new
+head_smells = [
+    {'type': 'LongFunction', 'name': 'update_user', 'line': 14,
+     'message': 'Function update_user has 22 statements (recommended: max 20)', 'severity': 'medium'},
+    {'type': 'GodClass', 'name': 'UserManager', 'line': 5,
+     'message': 'Class UserManager has 16 methods (possible God Class)', 'severity': 'high'},
+]
+
+store.add_findings(base_smells, commit_sha='abc123', file_path='test_code.py')
+store.add_findings(head_smells, commit_sha='def456', file_path='test_code.py')
+
+diff = store.new_vs_fixed('abc123', 'def456')
+assert diff['new'] == [('test_code.py', 'GodClass', 'UserManager')]
+assert diff['fixed'] == [('test_code.py', 'TooManyParameters', 'process_user_data')]
+
+assert store.top_offenders(by='name', limit=1) == [('update_user', 2)]
+assert store.severity_histogram(commit_sha='def456') == {'high': 1, 'medium': 1}
+
+# Same-named methods of different classes are told apart by their qualified name
+store.add_findings(
+    [{'type': 'LongFunction', 'name': '__init__', 'qualname': 'A.__init__', 'line': 3,
+      'message': 'Function __init__ has 25 statements (recommended: max 20)', 'severity': 'medium'}],
+    commit_sha='base2', file_path='models.py'
+)
+store.add_findings(
+    [{'type': 'LongFunction', 'name': '__init__', 'qualname': 'A.__init__', 'line': 3,
+      'message': 'Function __init__ has 25 statements (recommended: max 20)', 'severity': 'medium'},
+     {'type': 'LongFunction', 'name': '__init__', 'qualname': 'B.__init__', 'line': 40,
+      'message': 'Function __init__ has 22 statements (recommended: max 20)', 'severity': 'medium'}],
+    commit_sha='head2', file_path='models.py'
+)
+assert store.new_vs_fixed('base2', 'head2') == {
+    'new': [('models.py', 'LongFunction', 'B.__init__')],
+    'fixed': [],
+}
+
+# Re-ingesting a commit replaces its findings instead of counting them twice
+store.add_findings(head_smells, commit_sha='def456', file_path='test_code.py')
+assert store.severity_histogram(commit_sha='def456') == {'high': 1, 'medium': 1}
+assert store.top_offenders(by='file_path', commit_sha='def456') == [('test_code.py', 2)]
+
+print("New findings:", diff['new'])
+print("Fixed findings:", diff['fixed'])
+print("Severity histogram:", store.severity_histogram())
+
+store.close()
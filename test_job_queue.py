@@ -0,0 +1,60 @@
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from src.job_queue import AnalysisJobQueue, extract_archive
+
+
+def build_archive(work_dir: str) -> str:
+    """Pack the repository's own sources as an uploaded project."""
+    archive_path = os.path.join(work_dir, 'project.tar.gz')
+    with tarfile.open(archive_path, 'w:gz') as archive:
+        archive.add('src', arcname='project/src')
+        archive.add('test_code.py', arcname='project/test_code.py')
+    return archive_path
+
+
+# Worker processes are spawned, so only run the check in the main process
+if __name__ == '__main__':
+    work_dir = tempfile.mkdtemp()
+    archive_path = build_archive(work_dir)
+
+    big_root = tempfile.mkdtemp(dir=work_dir)
+    big_files = extract_archive(archive_path, big_root)
+    small_root = tempfile.mkdtemp(dir=work_dir)
+    small_files = extract_archive(archive_path, small_root)
+    assert 'project/test_code.py' in small_files
+
+    # Archives that unpack to more than max_bytes are rejected up front
+    bomb_root = tempfile.mkdtemp(dir=work_dir)
+    try:
+        extract_archive(archive_path, bomb_root, max_bytes=1024)
+        raise AssertionError("oversized archive was extracted")
+    except ValueError as e:
+        assert 'bytes' in str(e)
+    assert os.listdir(bomb_root) == []
+
+    # One worker makes the scheduling order easy to check
+    queue = AnalysisJobQueue(num_workers=1)
+
+    # A large upload followed by a small one from another user
+    big_job = queue.get_job(queue.submit('user-a', big_root, big_files * 10))
+    small_job = queue.get_job(queue.submit('user-b', small_root, ['project/test_code.py']))
+
+    while big_job.status != 'done':
+        snapshot = big_job.snapshot()
+        print(f"user-a: {snapshot['processed']}/{snapshot['total']} files, "
+              f"{len(snapshot['smells'])} smells so far | user-b: {small_job.status}")
+        time.sleep(0.2)
+
+    # The small job wasn't starved by the large one
+    assert small_job.finished_at < big_job.finished_at
+    assert small_job.snapshot()['errors'] == []
+    assert {s['file'] for s in small_job.snapshot()['smells']} == {'project/test_code.py'}
+    assert not os.path.exists(big_root)
+
+    print(f"user-b finished {big_job.finished_at - small_job.finished_at:.2f}s before user-a")
+    queue.shutdown()
+    shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.ai_agent import CodeReviewAgent
+from src.model_router import ModelRouter
+
+# Simulated response time per model (seconds)
+STUB_LATENCY = {'slow-model': 1.0, 'fast-model': 0.05}
+STUB_CALLS = []
+# Number of rate-limited (429) responses a model gets before succeeding
+STUB_RATE_LIMITED = {'flaky-model': 1}
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Chat Completions endpoint."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        STUB_CALLS.append(body['model'])
+        time.sleep(STUB_LATENCY.get(body['model'], 0))
+
+        if STUB_RATE_LIMITED.get(body['model'], 0) > 0:
+            STUB_RATE_LIMITED[body['model']] -= 1
+            error = json.dumps({'error': {'message': 'Rate limit reached', 'type': 'requests'}}).encode()
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(error)))
+            self.end_headers()
+            self.wfile.write(error)
+            return
+
+        payload = json.dumps({
+            'id': 'stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': f"Suggestion from {body['model']}"},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 100, 'completion_tokens': body['max_tokens'] // 10, 'total_tokens': 0},
+        }).encode()
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client already gave up on this (deliberately slow) request
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StubChatHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+os.environ.setdefault('OPENAI_API_KEY', 'stub-key')
+
+tiers = {
+    'premium': {'model': 'slow-model', 'max_tokens': 2000, 'prompt_variant': 'detailed',
+                'latency_slo': 0.3, 'fallback': 'fast'},
+    'fast': {'model': 'fast-model', 'max_tokens': 500, 'prompt_variant': 'concise',
+             'latency_slo': 0.5, 'fallback': None},
+}
+router = ModelRouter(tiers=tiers, routing_table={(None, None): 'premium'}, cooldown=60)
+agent = CodeReviewAgent(router=router, base_url=f"http://127.0.0.1:{server.server_port}/v1")
+
+smell = {
+    'type': 'GodClass',
+    'name': 'UserManager',
+    'line': 5,
+    'message': 'Class UserManager has 16 methods (possible God Class)',
+    'predicted_severity': 'high'
+}
+
+# First request times out on the slow tier and falls back to the fast one
+assert agent.generate_suggestion(smell) == "Suggestion from fast-model"
+
+# While the premium tier is in cooldown it is skipped entirely
+assert router.select_tier(smell) == 'fast'
+assert agent.generate_suggestion(smell) == "Suggestion from fast-model"
+
+stats = router.get_stats()
+assert stats['premium']['budget_exceeded'] == 1
+assert stats['fast']['requests'] == 2
+assert stats['fast']['completion_tokens'] == 100
+
+for tier, summary in stats.items():
+    print(f"{tier}: {summary}")
+
+# A rate-limited request is retried instead of failing, and counted as an error
+flaky_router = ModelRouter(
+    tiers={'flaky': {'model': 'flaky-model', 'max_tokens': 500, 'prompt_variant': 'concise',
+                     'latency_slo': 0.5, 'fallback': None}},
+    routing_table={(None, None): 'flaky'}
+)
+flaky_agent = CodeReviewAgent(router=flaky_router, base_url=f"http://127.0.0.1:{server.server_port}/v1")
+assert flaky_agent.generate_suggestion(smell) == "Suggestion from flaky-model"
+flaky_stats = flaky_router.get_stats()['flaky']
+assert flaky_stats['requests'] == 2
+assert flaky_stats['errors'] == 1
+assert flaky_stats['budget_exceeded'] == 0
+
+server.shutdown()
@@ -0,0 +1,38 @@
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from generate_training_data import training_data
+from src.model_selection import ModelSelectionHarness
+
+# Two small candidates keep the check quick
+harness = ModelSelectionHarness(
+    candidates={
+        'logistic_regression': LogisticRegression(max_iter=1000, random_state=42),
+        'decision_tree': DecisionTreeClassifier(max_depth=3, random_state=42),
+    },
+    n_splits=3, n_jobs=2, batch_size=100, repeats=5
+)
+results = harness.evaluate(training_data)
+
+# One result per candidate, with one score per (candidate, fold)
+assert sorted(r['name'] for r in results) == ['decision_tree', 'logistic_regression']
+for result in results:
+    for key in ('accuracy_mean', 'single_latency_ms', 'batch_latency_ms', 'model_size_bytes', 'meets_budget'):
+        assert key in result, key
+    assert len(result['fold_scores']) == 3
+    assert all(0.0 <= score <= 1.0 for score in result['fold_scores'])
+    assert result['model_size_bytes'] > 0
+    assert result['meets_budget']  # no budget set
+harness.print_report(results)
+
+# Ranking: in-budget models first, then by accuracy, then by latency
+# (synthetic results, so the check doesn't depend on machine speed)
+harness.latency_budget_ms = 1.0
+ranked = harness._rank([
+    {'name': 'slow_accurate', 'accuracy_mean': 0.99, 'single_latency_ms': 5.0},
+    {'name': 'fast_weak', 'accuracy_mean': 0.80, 'single_latency_ms': 0.1},
+    {'name': 'fast_strong', 'accuracy_mean': 0.90, 'single_latency_ms': 0.5},
+    {'name': 'fastest_strong', 'accuracy_mean': 0.90, 'single_latency_ms': 0.2},
+])
+assert [r['name'] for r in ranked] == ['fastest_strong', 'fast_strong', 'fast_weak', 'slow_accurate']
+assert [r['meets_budget'] for r in ranked] == [True, True, True, False]
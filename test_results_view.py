@@ -0,0 +1,41 @@
+from src.results_view import SORT_OPTIONS, build_view, paginate
+
+smells = [
+    {'type': 'LongFunction', 'name': 'load_data', 'line': 30, 'severity': 'medium'},
+    {'type': 'TooManyParameters', 'name': 'create_user', 'line': 10, 'severity': 'low',
+     'predicted_severity': 'high'},
+    {'type': 'GodClass', 'name': 'DataManager', 'line': 50, 'severity': 'high'},
+    {'type': 'LongFunction', 'name': 'save_data', 'line': 5, 'severity': 'low'},
+]
+
+# No filters keeps everything
+assert sorted(build_view(smells)) == [0, 1, 2, 3]
+
+# Severity filter uses the ML prediction when there is one
+assert sorted(build_view(smells, severities=['high'])) == [1, 2]
+assert build_view(smells, severities=['low']) == [3]
+
+# Type filter
+assert sorted(build_view(smells, types=['LongFunction'])) == [0, 3]
+
+# Name filter is a case-insensitive substring match
+assert sorted(build_view(smells, name_query='  DATA ')) == [0, 2, 3]
+assert build_view(smells, types=['LongFunction'], name_query='save') == [3]
+assert build_view(smells, name_query='missing') == []
+
+# Every sort option
+assert build_view(smells, sort_by='Severity') == [1, 2, 0, 3]
+assert build_view(smells, sort_by='Line') == [3, 1, 0, 2]
+assert build_view(smells, sort_by='Type') == [2, 3, 0, 1]
+assert build_view(smells, sort_by='Name') == [2, 1, 0, 3]
+assert set(SORT_OPTIONS) == {'Severity', 'Line', 'Type', 'Name'}
+
+# Pagination clamps out-of-range pages
+indices = list(range(25))
+assert paginate(indices, 1, 10) == (list(range(10)), 3)
+assert paginate(indices, 3, 10) == (list(range(20, 25)), 3)
+assert paginate(indices, 0, 10) == (list(range(10)), 3)
+assert paginate(indices, 99, 10) == (list(range(20, 25)), 3)
+assert paginate([], 5, 10) == ([], 1)
+
+print("Results view filtering, sorting and pagination OK")
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from src.findings_store import FindingsStore
+from src.sharding import merge_manifests, run_shard, shard_files
+
+# Analyze the repository's own Python files
+paths = sorted(
+    os.path.join(root, name)
+    for root, _, names in os.walk('.')
+    for name in names
+    if name.endswith('.py') and '.venv' not in root
+)
+
+# Both strategies are deterministic and cover every file exactly once
+for strategy in ('hash', 'size'):
+    shards = shard_files(paths, 3, strategy)
+    assert shards == shard_files(list(reversed(paths)), 3, strategy)
+    assert sorted(p for shard in shards for p in shard) == sorted(set(paths))
+
+with tempfile.TemporaryDirectory() as tmp:
+    # A missing file is reported instead of failing its shard
+    missing_path = os.path.join(tmp, 'does_not_exist.py')
+    file_list = os.path.join(tmp, 'files.txt')
+    with open(file_list, 'w') as f:
+        f.write('\n'.join(paths + [missing_path]))
+
+    # Local worker processes stand in for separate nodes
+    num_shards = 3
+    outputs = [os.path.join(tmp, f'shard_{i}.json') for i in range(num_shards)]
+    workers = [
+        subprocess.Popen([
+            sys.executable, '-m', 'src.sharding', 'scan', file_list,
+            '--shard-index', str(i), '--num-shards', str(num_shards),
+            '--strategy', 'size', '--output', outputs[i]
+        ])
+        for i in range(num_shards)
+    ]
+    assert all(worker.wait() == 0 for worker in workers)
+
+    # Merging in any order gives the same report; duplicates are dropped
+    report = merge_manifests(outputs)
+    assert report == merge_manifests(list(reversed(outputs)) + outputs[:1])
+    assert report['missing_shards'] == []
+    assert [entry['path'] for entry in report['files']] == sorted(set(paths + [missing_path]))
+    assert [error['path'] for error in report['errors']] == [missing_path]
+
+    # The merge step persists findings for historical queries
+    db_path = os.path.join(tmp, 'findings.db')
+    subprocess.run([
+        sys.executable, '-m', 'src.sharding', 'merge', *outputs,
+        '--output', os.path.join(tmp, 'report.json'), '--db', db_path, '--commit', 'abc123',
+        '--write-baseline', os.path.join(tmp, 'baseline.json')
+    ], check=True)
+    store = FindingsStore(db_path)
+    assert sum(store.severity_histogram(commit_sha='abc123').values()) == len(report['smells'])
+    store.close()
+
+    # Rescanning with the written baseline reports nothing new
+    rescan = run_shard(paths, 0, num_shards, os.path.join(tmp, 'rescan.json'), 'size',
+                       baseline_path=os.path.join(tmp, 'baseline.json'))
+    with open(outputs[0]) as f:
+        first_shard = json.load(f)
+    assert rescan['smells'] == []
+    assert rescan['suppressed'] == len(first_shard['smells'])
+
+    # Shards scanned from a different file list are rejected
+    other = run_shard(paths[1:], 1, num_shards, os.path.join(tmp, 'other.json'), 'size')
+    assert other['input_digest'] != report['input_digest']
+    try:
+        merge_manifests([outputs[0], os.path.join(tmp, 'other.json'), outputs[2]])
+        raise AssertionError("merged shards of different file lists")
+    except ValueError as e:
+        assert 'input_digest' in str(e)
+
+    partial = merge_manifests(outputs[:2])
+    assert partial['missing_shards'] == [2]
+
+    print(f"Merged {len(report['files'])} files from {num_shards} shards")
+    print(json.dumps(report['smells'][:3], indent=2))
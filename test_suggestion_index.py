@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+from src.ai_agent import CodeReviewAgent
+from src.suggestion_index import SuggestionIndex, similarity_group, similarity_text
+
+os.environ.setdefault('OPENAI_API_KEY', 'stub-key')
+
+
+class CountingAgent(CodeReviewAgent):
+    """Agent whose model call is a canned answer, so no API is needed."""
+
+    calls = 0
+
+    def _call_tier(self, tier, smell):
+        CountingAgent.calls += 1
+        return f"Answer {CountingAgent.calls}: split `{smell['name']}` into smaller classes"
+
+
+smell = {
+    'type': 'GodClass',
+    'name': 'UserManager',
+    'line': 5,
+    'metric': 16,
+    'message': 'Class UserManager has 16 methods (possible God Class)',
+    'predicted_severity': 'high'
+}
+
+# A smell that only differs in name and line reuses the stored suggestion
+index = SuggestionIndex()
+agent = CountingAgent(suggestion_index=index)
+assert agent.generate_suggestion(smell, deep=True) == "Answer 1: split `UserManager` into smaller classes"
+assert agent.last_source == 'llm'
+
+renamed = dict(smell, name='OrderManager', line=90,
+               message='Class OrderManager has 16 methods (possible God Class)')
+assert agent.generate_suggestion(renamed, deep=True) == "Answer 1: split `OrderManager` into smaller classes"
+assert agent.last_source == 'index'
+assert CountingAgent.calls == 1
+
+# A different method count is not "similar", and reuse=False regenerates
+agent.generate_suggestion(dict(smell, metric=30, message='Class UserManager has 30 methods (possible God Class)'))
+assert agent.last_source == 'llm'
+assert agent.generate_suggestion(smell, reuse=False) == "Answer 3: split `UserManager` into smaller classes"
+assert agent.last_source == 'llm'
+assert CountingAgent.calls == 3
+
+# The regenerated answer replaced the old one instead of being stored twice
+assert index.size == 2
+assert index.query(similarity_text(smell), similarity_group(smell))['suggestion'].startswith("Answer 3")
+
+# Reused suggestions only rename inside code, not in the prose
+entry = {'name': 'load', 'suggestion': "We load data twice.\n\n```python\ndef load(path):\n```\nCall `load()` once."}
+assert SuggestionIndex.adapt(entry, 'fetch') == "We load data twice.\n\n```python\ndef fetch(path):\n```\nCall `fetch()` once."
+
+# Eviction drops the least recently used entry once the index is full
+index = SuggestionIndex(max_size=3)
+for i in range(3):
+    index.add(f"LongFunction medium function has {i} statements", f"suggestion {i}", group='LongFunction')
+index.query("LongFunction medium function has 0 statements", 'LongFunction')  # 0 is now the most recent
+index.add("LongFunction medium function has 3 statements", "suggestion 3", group='LongFunction')
+assert index.size == 3
+assert sorted(entry['suggestion'] for entry in index.entries) == ['suggestion 0', 'suggestion 2', 'suggestion 3']
+
+# A full index round-trips through save() and keeps its LRU order after load()
+index_path = os.path.join(tempfile.mkdtemp(), 'suggestion_index.npz')
+index.save(index_path)
+assert not os.path.exists(index_path + '.tmp')
+
+loaded = SuggestionIndex.load(index_path)
+assert (loaded.size, loaded.max_size, loaded.threshold) == (3, 3, index.threshold)
+assert loaded.entries == index.entries
+assert loaded.query("LongFunction medium function has 3 statements", 'LongFunction')['suggestion'] == 'suggestion 3'
+loaded.add("LongFunction medium function has 4 statements", "suggestion 4", group='LongFunction')
+assert sorted(entry['suggestion'] for entry in loaded.entries) == ['suggestion 0', 'suggestion 3', 'suggestion 4']
+
+print(f"Suggestion index: reuse, regeneration, eviction and reload OK ({CountingAgent.calls} model calls)")